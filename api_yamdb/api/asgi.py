@@ -0,0 +1,212 @@
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core import signals
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import RequestAborted
+from django.core.handlers.asgi import ASGIHandler
+from django.http import FileResponse
+from django.urls import Resolver404, resolve, set_script_prefix
+
+from .cache import get_cache, get_version, record
+from .metrics import observe
+from .middleware import get_route
+
+CONDITIONAL_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASGI_THREADS,
+                thread_name_prefix='asgi-worker')
+        return _executor
+
+
+def run_in_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return loop.run_in_executor(
+        get_executor(), partial(context.run, func, *args))
+
+
+async def call_cache(method, *args):
+    # Only an in-process cache can be read without blocking the loop.
+    if isinstance(get_cache(), LocMemCache):
+        return method(*args)
+    return await run_in_pool(method, *args)
+
+
+def get_cached_list(request):
+    if (request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META
+            or any(header in request.META
+                   for header in CONDITIONAL_HEADERS)):
+        return None
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    view_class = getattr(match.func, 'cls', None)
+    namespace = getattr(view_class, 'cache_namespace', None)
+    actions = getattr(match.func, 'actions', None) or {}
+    if namespace is None or actions.get('get') != 'list':
+        return None
+    return match.func, namespace
+
+
+def build_response_key(namespace, version, request):
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+    ))
+    fingerprint = '|'.join((
+        request.path, query, request.META.get('HTTP_ACCEPT', '')))
+    digest = hashlib.md5(fingerprint.encode()).hexdigest()
+    return f'api:asgi:{namespace}:{version}:{digest}'
+
+
+class ThreadPoolASGIHandler(ASGIHandler):
+    # Django 3.2 runs every sync view and middleware of an ASGI request on
+    # one shared thread. Here each request goes through the sync handler on
+    # a bounded pool instead, and anonymous list responses that the views
+    # cache anyway are served from the loop without taking a worker.
+
+    def __init__(self):
+        super().__init__()
+        # Workers call the middleware chain synchronously.
+        self.load_middleware()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(
+                'Django can only handle ASGI/HTTP connections, not %s.'
+                % scope['type'])
+        try:
+            body_file = await self.read_body(receive)
+        except RequestAborted:
+            return
+        set_script_prefix(self.get_script_prefix(scope))
+        request, error_response = self.create_request(scope, body_file)
+        if request is None:
+            await self.send_response(error_response, send)
+            return
+        started = time.perf_counter()
+        cached_list = get_cached_list(request)
+        key = None
+        if cached_list is not None:
+            view, namespace = cached_list
+            version = await call_cache(get_version, namespace)
+            key = build_response_key(namespace, version, request)
+            cached = await call_cache(get_cache().get, key)
+            if cached is not None:
+                record(namespace, hit=True)
+                await self.send_cached(cached, send)
+                if settings.METRICS_ENABLED:
+                    observe(get_route(request, view) + (request.method,),
+                            cached['status'],
+                            duration=time.perf_counter() - started,
+                            queries=0, db_time=0, render_time=None,
+                            size=len(cached['content']))
+                return
+        response = await run_in_pool(self.get_pooled_response, request)
+        if key is not None and self.is_cacheable(response):
+            await call_cache(get_cache().set, key, {
+                'status': response.status_code,
+                'headers': self.get_headers(response),
+                'content': response.content,
+            }, settings.API_CACHE_TIMEOUT)
+        await self.send_response(response, send)
+
+    def get_pooled_response(self, request):
+        signals.request_started.send(
+            sender=self.__class__, scope=request.scope)
+        response = self.get_response(request)
+        response._handler_class = self.__class__
+        if isinstance(response, FileResponse):
+            response.block_size = self.chunk_size
+        if not response.streaming:
+            # The body is already rendered, finish the request on this
+            # worker instead of coming back to the pool for it.
+            response.close()
+        return response
+
+    @staticmethod
+    def is_cacheable(response):
+        return (response.status_code == 200 and not response.streaming
+                and not response.cookies)
+
+    @staticmethod
+    def get_headers(response):
+        headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode('ascii')
+            if isinstance(value, str):
+                value = value.encode('latin1')
+            headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            headers.append((b'Set-Cookie',
+                            cookie.output(header='').encode('ascii').strip()))
+        return headers
+
+    async def send_cached(self, cached, send):
+        await send({
+            'type': 'http.response.start',
+            'status': cached['status'],
+            'headers': cached['headers'],
+        })
+        for chunk, last in self.chunk_bytes(cached['content']):
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': not last,
+            })
+
+    async def send_response(self, response, send):
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': self.get_headers(response),
+        })
+        if response.streaming:
+            # Streaming bodies may run queries while they are iterated, so
+            # a worker drives the iterator and hands chunks to the loop.
+            await run_in_pool(
+                self.stream, response, send, asyncio.get_running_loop())
+            await send({'type': 'http.response.body'})
+            return
+        for chunk, last in self.chunk_bytes(response.content):
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': not last,
+            })
+
+    def stream(self, response, send, loop):
+        try:
+            for part in response:
+                for chunk, _ in self.chunk_bytes(part):
+                    asyncio.run_coroutine_threadsafe(send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    }), loop).result()
+        finally:
+            response.close()
+
+
+def get_asgi_application():
+    return ThreadPoolASGIHandler()
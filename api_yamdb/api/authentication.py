@@ -0,0 +1,104 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.functional import LazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+CLAIMS = ('username', 'role', 'is_superuser')
+STATE_FIELDS = CLAIMS + ('is_active',)
+
+
+class UserStateCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        state = (User.objects.filter(pk=user_id)
+                 .values(*STATE_FIELDS).first())
+        with self._lock:
+            self._entries[user_id] = (now + settings.JWT_USER_STATE_TTL,
+                                      state)
+        return state
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_states = UserStateCache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_state(sender, instance, **kwargs):
+    user_states.invalidate(instance.pk)
+
+
+class TokenUser(LazyObject):
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, attributes):
+        super().__init__()
+        self.__dict__.update(attributes, pk=user_id, id=user_id)
+
+    def _setup(self):
+        try:
+            self._wrapped = User.objects.get(pk=self.__dict__['pk'])
+        except User.DoesNotExist:
+            raise AuthenticationFailed('User not found',
+                                       code='user_not_found')
+
+    def __setattr__(self, name, value):
+        if name != '_wrapped' and name in self.__dict__:
+            self.__dict__[name] = value
+        super().__setattr__(name, value)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_token_user(request, validated_token), validated_token
+
+    def get_token_user(self, request, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification')
+        # Reads check the cached state too, so a deleted, deactivated or
+        # demoted user loses access within JWT_USER_STATE_TTL.
+        state = user_states.get(user_id)
+        if state is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not state['is_active']:
+            raise AuthenticationFailed('User is inactive',
+                                       code='user_inactive')
+        return TokenUser(user_id, state)
@@ -0,0 +1,267 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
+
+from reviews.models import Category, Genre, Title
+
+from .cache import invalidate
+from .query_plans import plan_queryset
+from .serializers import (BulkCategorySerializer,
+                          BulkGenreSerializer,
+                          BulkTitleSerializer,
+                          BulkTitleUpdateSerializer,
+                          TitleSerializer)
+
+DOES_NOT_EXIST = (
+    serializers.SlugRelatedField.default_error_messages['does_not_exist'])
+TOO_MANY = serializers.ListField.default_error_messages['max_length']
+
+
+def does_not_exist(slug_name, value):
+    return DOES_NOT_EXIST.format(slug_name=slug_name, value=value)
+
+
+def resolve_slugs(model, slugs):
+    return dict(model.objects.filter(slug__in=set(slugs))
+                .values_list('slug', 'pk'))
+
+
+def insert(model, objs):
+    model.objects.bulk_create(objs)
+    if objs and objs[0].pk is None:
+        # Django 3.2 can't read ids back from a bulk INSERT on SQLite, but
+        # the write lock is held until commit, so the newest rows are ours.
+        ids = list(model.objects.order_by('-pk')
+                   .values_list('pk', flat=True)[:len(objs)])
+        for obj, pk in zip(objs, reversed(ids)):
+            obj.pk = pk
+    return objs
+
+
+class BulkWriteMixin:
+    bulk_lookup = 'slug'
+    bulk_lookup_field = serializers.SlugField
+    bulk_create_serializer_class = None
+    bulk_update_serializer_class = None
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def bulk(self, request):
+        if request.method == 'POST':
+            return self.bulk_create(request.data)
+        if request.method == 'PATCH':
+            return self.bulk_update(request.data)
+        return self.bulk_destroy(request.data)
+
+    def bulk_create(self, data):
+        items = self.validate_items(self.bulk_create_serializer_class, data)
+        self.raise_for_errors(self.prepare_items(items, created=True))
+        with transaction.atomic():
+            objs = self.create_items(items)
+            invalidate(*self.invalidates_cache)
+        return Response(self.get_bulk_data(objs),
+                        status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, data):
+        items = self.validate_items(self.bulk_update_serializer_class, data)
+        lookups = [item[self.bulk_lookup] for item in items]
+        targets = self.get_targets(lookups)
+        errors = [
+            {self.bulk_lookup: lookup_errors, **item_errors}
+            if lookup_errors else item_errors
+            for lookup_errors, item_errors in zip(
+                self.get_lookup_errors(lookups, targets),
+                self.prepare_items(items, created=False))
+        ]
+        self.raise_for_errors(errors)
+        with transaction.atomic():
+            objs = self.update_items(
+                [(targets[lookup], item)
+                 for lookup, item in zip(lookups, items)])
+            invalidate(*self.invalidates_cache)
+        return Response(self.get_bulk_data(objs))
+
+    def bulk_destroy(self, data):
+        lookups = serializers.ListField(
+            child=self.bulk_lookup_field(), allow_empty=False,
+            max_length=settings.BULK_WRITE_MAX_ITEMS).run_validation(data)
+        targets = self.get_targets(lookups)
+        errors = self.get_lookup_errors(lookups, targets)
+        if any(errors):
+            raise ValidationError({
+                index: error for index, error in enumerate(errors) if error})
+        with transaction.atomic():
+            self.delete_items([targets[lookup] for lookup in lookups])
+            invalidate(*self.invalidates_cache)
+        return Response([{self.bulk_lookup: lookup} for lookup in lookups])
+
+    def validate_items(self, serializer_class, data):
+        if (isinstance(data, list)
+                and len(data) > settings.BULK_WRITE_MAX_ITEMS):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                TOO_MANY.format(max_length=settings.BULK_WRITE_MAX_ITEMS)]})
+        serializer = serializer_class(data=data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @staticmethod
+    def raise_for_errors(errors):
+        if any(errors):
+            raise ValidationError(errors)
+
+    def get_targets(self, lookups):
+        return self.queryset.model.objects.in_bulk(
+            set(lookups), field_name=self.bulk_lookup)
+
+    def get_lookup_errors(self, lookups, targets):
+        errors, seen = [], set()
+        for lookup in lookups:
+            if lookup not in targets:
+                errors.append([does_not_exist(self.bulk_lookup, lookup)])
+            elif lookup in seen:
+                errors.append([UniqueValidator.message])
+            else:
+                errors.append([])
+            seen.add(lookup)
+        return errors
+
+    def get_bulk_data(self, objs):
+        return self.get_serializer(objs, many=True).data
+
+    def prepare_items(self, items, created):
+        return [{} for _ in items]
+
+
+class BulkSlugWriteMixin(BulkWriteMixin):
+    title_relation = None
+
+    def prepare_items(self, items, created):
+        if not created:
+            return super().prepare_items(items, created)
+        taken = set(resolve_slugs(
+            self.queryset.model, [item['slug'] for item in items]))
+        errors = []
+        for item in items:
+            if item['slug'] in taken:
+                errors.append({'slug': [UniqueValidator.message]})
+            else:
+                errors.append({})
+            taken.add(item['slug'])
+        return errors
+
+    def create_items(self, items):
+        model = self.queryset.model
+        return model.objects.bulk_create([model(**item) for item in items])
+
+    def update_items(self, pairs):
+        for obj, item in pairs:
+            obj.name = item['name']
+        objs = [obj for obj, _ in pairs]
+        self.queryset.model.objects.bulk_update(objs, ['name'])
+        self.touch_titles(objs)
+        return objs
+
+    def delete_items(self, objs):
+        self.touch_titles(objs)
+        self.queryset.model.objects.filter(
+            pk__in=[obj.pk for obj in objs]).delete()
+
+    def touch_titles(self, objs):
+        Title.objects.filter(
+            **{f'{self.title_relation}__in': objs}
+        ).update(modified=timezone.now())
+
+
+class BulkCategoryWriteMixin(BulkSlugWriteMixin):
+    bulk_create_serializer_class = BulkCategorySerializer
+    bulk_update_serializer_class = BulkCategorySerializer
+    title_relation = 'category'
+
+
+class BulkGenreWriteMixin(BulkSlugWriteMixin):
+    bulk_create_serializer_class = BulkGenreSerializer
+    bulk_update_serializer_class = BulkGenreSerializer
+    title_relation = 'genre'
+
+
+class BulkTitleWriteMixin(BulkWriteMixin):
+    bulk_lookup = 'id'
+    bulk_lookup_field = serializers.IntegerField
+    bulk_create_serializer_class = BulkTitleSerializer
+    bulk_update_serializer_class = BulkTitleUpdateSerializer
+
+    def prepare_items(self, items, created):
+        genres = resolve_slugs(
+            Genre, [slug for item in items for slug in item.get('genre', ())])
+        categories = resolve_slugs(
+            Category, [item['category'] for item in items
+                       if 'category' in item])
+        errors = []
+        for item in items:
+            error = {}
+            missing = [slug for slug in item.get('genre', ())
+                       if slug not in genres]
+            if missing:
+                error['genre'] = [does_not_exist('slug', slug)
+                                  for slug in missing]
+            elif 'genre' in item:
+                item['genre'] = list(dict.fromkeys(
+                    genres[slug] for slug in item['genre']))
+            if 'category' in item:
+                if item['category'] in categories:
+                    item['category_id'] = categories[item.pop('category')]
+                else:
+                    error['category'] = [
+                        does_not_exist('slug', item['category'])]
+            errors.append(error)
+        return errors
+
+    def create_items(self, items):
+        titles = insert(Title, [
+            Title(**{field: value for field, value in item.items()
+                     if field != 'genre'})
+            for item in items
+        ])
+        self.link_genres(zip(titles, (item['genre'] for item in items)))
+        return titles
+
+    def update_items(self, pairs):
+        now = timezone.now()
+        fields, relinked = {'modified'}, []
+        for title, item in pairs:
+            for field, value in item.items():
+                if field == 'genre':
+                    relinked.append((title, value))
+                elif field != self.bulk_lookup:
+                    setattr(title, field, value)
+                    fields.add(field)
+            title.modified = now
+        titles = [title for title, _ in pairs]
+        Title.objects.bulk_update(titles, sorted(fields))
+        if relinked:
+            Title.genre.through.objects.filter(
+                title_id__in=[title.pk for title, _ in relinked]).delete()
+            self.link_genres(relinked)
+        return titles
+
+    def delete_items(self, objs):
+        Title.objects.filter(pk__in=[obj.pk for obj in objs]).delete()
+
+    @staticmethod
+    def link_genres(pairs):
+        Title.genre.through.objects.bulk_create([
+            Title.genre.through(title_id=title.pk, genre_id=genre_id)
+            for title, genre_ids in pairs for genre_id in genre_ids
+        ])
+
+    def get_bulk_data(self, objs):
+        titles = plan_queryset(Title.objects.all(), TitleSerializer).in_bulk(
+            [obj.pk for obj in objs])
+        return TitleSerializer(
+            [titles[obj.pk] for obj in objs], many=True,
+            context=self.get_serializer_context()).data
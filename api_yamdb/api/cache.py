@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from core.db_routers import primary_reads
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f'api:version:{namespace}'
+
+
+def _new_version():
+    # A lost version key must not restart at a value whose ETags and
+    # cached responses clients may still hold.
+    return time.time_ns()
+
+
+def get_version(namespace):
+    cache = get_cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def _bump(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.set(_version_key(namespace), _new_version(), None)
+
+
+def invalidate(*namespaces):
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def build_key(namespace, request):
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'api:response:{namespace}:{get_version(namespace)}:{digest}'
+
+
+def record(namespace, hit):
+    with _stats_lock:
+        (_hits if hit else _misses)[namespace] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        return {
+            namespace: {'hits': _hits[namespace],
+                        'misses': _misses[namespace]}
+            for namespace in sorted(set(_hits) | set(_misses))
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
+
+
+def get_or_build(namespace, request, build, timeout):
+    key = build_key(namespace, request)
+    data = get_cache().get(key)
+    record(namespace, hit=data is not None)
+    if data is None:
+        # A lagging replica would store stale data under the new version.
+        with primary_reads():
+            data = build()
+        get_cache().set(key, data, timeout)
+    return data
+
+
+class CachedListMixin:
+    cache_namespace = None
+    invalidates_cache = ()
+
+    def is_cacheable(self, request):
+        return (request.method == 'GET'
+                and not request.user.is_authenticated)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        key = build_key(self.cache_namespace, request)
+        data = get_cache().get(key)
+        record(self.cache_namespace, hit=data is not None)
+        if data is not None:
+            return Response(data)
+        with primary_reads():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            get_cache().set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate(*self.invalidates_cache)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate(*self.invalidates_cache)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate(*self.invalidates_cache)
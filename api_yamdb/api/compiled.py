@@ -0,0 +1,232 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.relations import PKOnlyObject
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .metrics import measure_serialization
+
+OWNER = '_compiled_owner'
+
+UNSUPPORTED_FIELDS = (
+    serializers.SerializerMethodField,
+    serializers.ModelField,
+    serializers.FileField,
+    serializers.ManyRelatedField,
+)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def _get_field(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise UnsupportedField(name)
+    if not field.concrete:
+        raise UnsupportedField(name)
+    return field
+
+
+def _value(key, field):
+    def access(row):
+        value = row[key]
+        return None if value is None else field.to_representation(value)
+    return access
+
+
+def _primary_key(key, field):
+    def access(row):
+        value = row[key]
+        if value is None:
+            return None
+        return field.to_representation(PKOnlyObject(pk=value))
+    return access
+
+
+def _nested(key, accessors):
+    def access(row):
+        if row[key] is None:
+            return None
+        return {name: accessor(row) for name, accessor in accessors}
+    return access
+
+
+def _related(key):
+    return lambda row: row[key]
+
+
+class ManyRelation:
+    # Loads the same rows, in the same order, as prefetch_related() does.
+
+    def __init__(self, model_field, child):
+        through = model_field.remote_field.through
+        self.related_model = model_field.related_model
+        self.query_name = model_field.related_query_name()
+        self.table = through._meta.db_table
+        self.column = through._meta.get_field(
+            model_field.m2m_field_name()).column
+        self.child = child
+
+    def load(self, pks, using):
+        groups = defaultdict(list)
+        if not pks:
+            return groups
+        quote_name = connections[using].ops.quote_name
+        rows = list(
+            self.related_model._default_manager.using(using)
+            .filter(**{f'{self.query_name}__in': pks})
+            .extra(select={OWNER: f'{quote_name(self.table)}.'
+                                  f'{quote_name(self.column)}'})
+            .values(OWNER, *self.child.lookups))
+        for row, item in zip(rows, self.child.serialize(rows, using)):
+            groups[row[OWNER]].append(item)
+        return groups
+
+
+class CompiledSerializer:
+    # Turns values() rows straight into the representation of a read-only
+    # ModelSerializer, calling each field's to_representation on the raw
+    # column value. Serializers with fields that need a model instance
+    # raise UnsupportedField and stay on the regular path.
+
+    def __init__(self, serializer, relations=True):
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise UnsupportedField(type(serializer).__name__)
+        model = serializer.Meta.model
+        self.pk = model._meta.pk.attname
+        self.lookups = [self.pk]
+        self.relations = [] if relations else None
+        self.accessors = self.compile(serializer, model, '')
+        self.field_names = tuple(name for name, _ in self.accessors)
+
+    def add_lookup(self, key):
+        if key not in self.lookups:
+            self.lookups.append(key)
+        return key
+
+    def compile(self, serializer, model, prefix):
+        return [
+            (name, self.compile_field(field, model, prefix))
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+
+    def compile_field(self, field, model, prefix):
+        if field.source == '*' or isinstance(field, UNSUPPORTED_FIELDS):
+            raise UnsupportedField(field.field_name)
+        *path, name = field.source_attrs
+        for attr in path:
+            relation = _get_field(model, attr)
+            # A missing related object makes DRF skip the field entirely.
+            if not relation.many_to_one or relation.null:
+                raise UnsupportedField(field.field_name)
+            model, prefix = relation.related_model, f'{prefix}{attr}__'
+        model_field = _get_field(model, name)
+        if model_field.is_relation:
+            return self.compile_relation(field, model_field, prefix)
+        if isinstance(field, (serializers.BaseSerializer,
+                              serializers.RelatedField)):
+            raise UnsupportedField(field.field_name)
+        return _value(self.add_lookup(prefix + name), field)
+
+    def compile_relation(self, field, model_field, prefix):
+        key = prefix + model_field.name
+        if isinstance(field, serializers.ListSerializer):
+            if (not model_field.many_to_many or prefix
+                    or self.relations is None):
+                raise UnsupportedField(field.field_name)
+            key = f'{OWNER}_{key}'
+            self.relations.append((key, ManyRelation(
+                model_field, CompiledSerializer(field.child, False))))
+            return _related(key)
+        if not model_field.many_to_one:
+            raise UnsupportedField(field.field_name)
+        if isinstance(field, serializers.BaseSerializer):
+            accessors = self.compile(
+                field, model_field.related_model, key + '__')
+            return _nested(self.add_lookup(key), accessors)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return _primary_key(self.add_lookup(key), field)
+        raise UnsupportedField(field.field_name)
+
+    def get_queryset(self, queryset):
+        return (queryset.select_related(None).prefetch_related(None)
+                .values(*self.lookups, *queryset.query.extra))
+
+    def serialize(self, rows, using):
+        rows = list(rows)
+        pks = [row[self.pk] for row in rows]
+        for key, relation in self.relations or ():
+            groups = relation.load(pks, using)
+            for row in rows:
+                row[key] = groups[row[self.pk]]
+        return [
+            {name: accessor(row) for name, accessor in self.accessors}
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_compiled_serializer(serializer_class):
+    try:
+        return CompiledSerializer(serializer_class())
+    except UnsupportedField:
+        return None
+
+
+class CompiledReadMixin:
+    compiled_actions = ('list', 'retrieve')
+
+    def get_compiled_serializer(self):
+        if (not settings.COMPILED_SERIALIZERS
+                or self.action not in self.compiled_actions
+                or isinstance(self.request.accepted_renderer,
+                              BrowsableAPIRenderer)):
+            return None
+        compiled = get_compiled_serializer(self.get_serializer_class())
+        if compiled is None:
+            return None
+        # Fields may depend on the request, as the stats of a title do.
+        fields = self.get_serializer().fields.items()
+        if compiled.field_names != tuple(
+                name for name, field in fields if not field.write_only):
+            return None
+        return compiled
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        queryset = compiled.get_queryset(
+            self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        with measure_serialization(request):
+            data = compiled.serialize(
+                queryset if page is None else page, queryset.db)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().retrieve(request, *args, **kwargs)
+        queryset = compiled.get_queryset(
+            self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        # Read actions only use permissions that do not look at the object.
+        self.check_object_permissions(request, row)
+        with measure_serialization(request):
+            data = compiled.serialize([row], queryset.db)[0]
+        return Response(data)
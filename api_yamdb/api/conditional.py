@@ -0,0 +1,74 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .cache import get_version
+
+
+def get_state(queryset):
+    return (queryset.select_related(None).prefetch_related(None).order_by()
+            .aggregate(last_modified=Max('modified'),
+                       count=Count('pk', distinct=True)))
+
+
+def make_etag(request, *parts):
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    fingerprint = '|'.join((
+        request.path,
+        query,
+        str(request.accepted_media_type),
+        *(str(part) for part in parts),
+    ))
+    return '"{}"'.format(hashlib.sha1(fingerprint.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+
+    def get_conditional_queryset(self):
+        queryset = self.get_queryset()
+        if self.action == 'list':
+            return self.filter_queryset(queryset)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def get_validators(self, request):
+        # Every write that can change a cached list bumps its namespace
+        # version, so the version alone tells whether the list changed.
+        namespace = getattr(self, 'cache_namespace', None)
+        if self.action == 'list' and namespace is not None:
+            return make_etag(request, namespace, get_version(namespace)), None
+        state = get_state(self.get_conditional_queryset())
+        last_modified = state['last_modified']
+        etag = make_etag(
+            request, state['count'],
+            last_modified.isoformat() if last_modified else '')
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, timestamp = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
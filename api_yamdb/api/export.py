@@ -0,0 +1,155 @@
+import csv
+import json
+from collections import defaultdict
+
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.negotiation import BaseContentNegotiation
+
+from reviews.models import Comment, Review, Title
+
+EXPORT_CHUNK_SIZE = 500
+
+CSV_HEADER = (
+    'title_id', 'name', 'year', 'description', 'category', 'genres',
+    'rating', 'review_id', 'author', 'score', 'text', 'pub_date',
+)
+
+pub_date_field = serializers.DateTimeField()
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def _title_chunks(chunk_size):
+    titles = (Title.objects.order_by('pk')
+              .values('id', 'name', 'year', 'description', 'rating',
+                      'category__slug'))
+    last_id = 0
+    while True:
+        chunk = list(titles.filter(pk__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]['id']
+
+
+def _genres_by_title(title_ids):
+    genres = defaultdict(list)
+    links = (Title.genre.through.objects.filter(title_id__in=title_ids)
+             .order_by('genre__slug')
+             .values_list('title_id', 'genre__slug'))
+    for title_id, slug in links.iterator():
+        genres[title_id].append(slug)
+    return genres
+
+
+def _review_pages(chunk_size):
+    # Keyset pages in title order, so they merge with the title chunks.
+    reviews = (Review.objects.order_by('title_id', 'id')
+               .values('id', 'title_id', 'author__username', 'score',
+                       'text', 'pub_date'))
+    page = list(reviews[:chunk_size])
+    while page:
+        yield page
+        last = page[-1]
+        page = list(reviews.filter(
+            Q(title_id__gt=last['title_id'])
+            | Q(title_id=last['title_id'], id__gt=last['id']))[:chunk_size])
+
+
+def _comments_by_review(review_ids, chunk_size):
+    comments = defaultdict(list)
+    rows = (Comment.objects.filter(review_id__in=review_ids)
+            .order_by('review_id', 'id')
+            .values('id', 'review_id', 'author__username', 'text',
+                    'pub_date'))
+    for row in rows.iterator(chunk_size=chunk_size):
+        comments[row['review_id']].append({
+            'id': row['id'],
+            'author': row['author__username'],
+            'text': row['text'],
+            'pub_date': pub_date_field.to_representation(row['pub_date']),
+        })
+    return comments
+
+
+def _review_document(row, comments):
+    return {
+        'id': row['id'],
+        'author': row['author__username'],
+        'score': row['score'],
+        'text': row['text'],
+        'pub_date': pub_date_field.to_representation(row['pub_date']),
+        'comments': comments.get(row['id'], []),
+    }
+
+
+def _iter_reviews(chunk_size, with_comments):
+    comments = {}
+    for page in _review_pages(chunk_size):
+        if with_comments:
+            comments = _comments_by_review(
+                [row['id'] for row in page], chunk_size)
+        for row in page:
+            yield row['title_id'], _review_document(row, comments)
+
+
+def iter_title_documents(chunk_size=EXPORT_CHUNK_SIZE, with_comments=True):
+    reviews = _iter_reviews(chunk_size, with_comments)
+    pending = next(reviews, None)
+    for chunk in _title_chunks(chunk_size):
+        genres = _genres_by_title([title['id'] for title in chunk])
+        for title in chunk:
+            title_reviews = []
+            while pending is not None and pending[0] <= title['id']:
+                if pending[0] == title['id']:
+                    title_reviews.append(pending[1])
+                pending = next(reviews, None)
+            yield {
+                'id': title['id'],
+                'name': title['name'],
+                'year': title['year'],
+                'description': title['description'],
+                'category': title['category__slug'],
+                'genre': genres.get(title['id'], []),
+                'rating': title['rating'],
+                'reviews': title_reviews,
+            }
+
+
+def stream_jsonl(chunk_size=EXPORT_CHUNK_SIZE):
+    for document in iter_title_documents(chunk_size):
+        yield json.dumps(document, ensure_ascii=False) + '\n'
+
+
+def _csv_rows(document):
+    title = (document['id'], document['name'], document['year'],
+             document['description'], document['category'],
+             ' '.join(document['genre']), document['rating'])
+    if not document['reviews']:
+        return [title + ('',) * 5]
+    return [title + (review['id'], review['author'], review['score'],
+                     review['text'], review['pub_date'])
+            for review in document['reviews']]
+
+
+def stream_csv(chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    documents = iter_title_documents(chunk_size, with_comments=False)
+    for document in documents:
+        for row in _csv_rows(document):
+            yield writer.writerow(row)
@@ -1,6 +1,8 @@
 import django_filters
+from rest_framework import filters
 
 from reviews.models import Title
+from reviews.search import get_backend, get_index
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -12,3 +14,24 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ['genre', 'category', 'year', 'name']
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        kind, _ = get_index(queryset.model)
+        if kind is None:
+            return super().filter_queryset(request, queryset, view)
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return get_backend().filter_queryset(queryset, query)
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering = [*ordering, 'id']
+        return ordering
@@ -0,0 +1,134 @@
+import textwrap
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+TUNED_MODELS = (Category, Genre, Title, Review, Comment)
+
+
+def title_endpoints(title):
+    yield f'/api/v1/titles/{title.pk}/'
+    filters = [{'year': title.year}, {'name': title.name}]
+    if title.category_id:
+        filters.append({'category': title.category.slug})
+    genre = title.genre.order_by('pk').first()
+    if genre is not None:
+        filters.append({'genre': genre.slug})
+    for query in filters:
+        yield f'/api/v1/titles/?{urlencode(query)}'
+        yield f'/api/v1/titles/top/?{urlencode(query)}'
+
+
+def nested_endpoints():
+    review = Review.objects.order_by('pk').first()
+    if review is not None:
+        reviews = f'/api/v1/titles/{review.title_id}/reviews/'
+        yield reviews
+        yield f'{reviews}{review.pk}/'
+    comment = (Comment.objects.select_related('review')
+               .order_by('pk').first())
+    if comment is not None:
+        comments = (f'/api/v1/titles/{comment.review.title_id}/reviews/'
+                    f'{comment.review_id}/comments/')
+        yield comments
+        yield f'{comments}{comment.pk}/'
+
+
+def get_endpoints():
+    yield '/api/v1/categories/'
+    yield '/api/v1/genres/'
+    yield '/api/v1/titles/'
+    yield '/api/v1/titles/?ordering=-rating'
+    yield '/api/v1/titles/top/'
+    yield '/api/v1/titles/top/?by=popularity'
+    title = Title.objects.select_related('category').order_by('pk').first()
+    if title is not None:
+        yield from title_endpoints(title)
+    yield from nested_endpoints()
+
+
+def capture_selects(client, url):
+    queries = []
+
+    def collect(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(collect):
+        response = client.get(url)
+    selects = [(sql, params) for sql, params in queries
+               if sql.lstrip().upper().startswith('SELECT')]
+    return response.status_code, selects
+
+
+def explain(sql, params, phase='after'):
+    # The phase comment keeps statements prepared with and without the
+    # tuned indexes apart in the driver's statement cache.
+    prefix = connection.ops.explain_query_prefix()
+    with connection.cursor() as cursor:
+        cursor.execute(f'{prefix} {sql} /* {phase} */', params)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+@contextmanager
+def without_tuned_indexes():
+    editor = connection.schema_editor()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for model in TUNED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(str(index.remove_sql(model, editor)))
+        try:
+            yield
+        finally:
+            transaction.set_rollback(True)
+
+
+class Command(BaseCommand):
+    help = ('Print the query plan of every statement issued by the read '
+            'endpoints, optionally compared with the plan without the '
+            'tuned indexes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Also show each plan with the tuned indexes dropped.')
+
+    def handle(self, *args, **options):
+        if options['compare'] and not connection.features.can_rollback_ddl:
+            raise CommandError(
+                f'{connection.vendor} cannot roll back DROP INDEX, '
+                '--compare is not supported.')
+        client = Client()
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            captured = [(url, *capture_selects(client, url))
+                        for url in get_endpoints()]
+        before = {}
+        if options['compare']:
+            with without_tuned_indexes():
+                before = {sql: explain(sql, params, 'before')
+                          for _, _, queries in captured
+                          for sql, params in queries}
+        for url, status, queries in captured:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'GET {url} [{status}]'))
+            for sql, params in queries:
+                self.write_plan(sql, params, before.get(sql), options)
+
+    def write_plan(self, sql, params, before, options):
+        if options['verbosity'] > 1:
+            self.stdout.write(textwrap.indent(sql, '  '))
+        else:
+            self.stdout.write('  ' + textwrap.shorten(sql, width=100))
+        after = explain(sql, params)
+        if before is not None:
+            self.stdout.write('    before: ' + '; '.join(before))
+            self.stdout.write('    after:  ' + '; '.join(after))
+        else:
+            self.stdout.write('    plan: ' + '; '.join(after))
@@ -0,0 +1,162 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+
+from rest_framework import mixins
+from rest_framework.response import Response
+
+from .cache import get_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+HISTOGRAMS = {
+    'duration': ('api_request_duration_seconds',
+                 'Request latency in seconds.', LATENCY_BUCKETS),
+    'queries': ('api_request_db_queries',
+                'SQL queries run per request.', QUERY_BUCKETS),
+    'db_time': ('api_request_db_seconds',
+                'Time spent in SQL queries per request.', LATENCY_BUCKETS),
+    'serialize_time': ('api_response_serialize_seconds',
+                       'Time spent serializing the response data.',
+                       LATENCY_BUCKETS),
+    'render_time': ('api_response_render_seconds',
+                    'Time spent rendering the response body.',
+                    LATENCY_BUCKETS),
+    'size': ('api_response_size_bytes',
+             'Response body size in bytes.', SIZE_BUCKETS),
+}
+ROUTE_LABELS = ('view', 'action', 'method')
+
+_lock = threading.Lock()
+_histograms = {}
+_requests = Counter()
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+def observe(route, status, **values):
+    with _lock:
+        _requests[route + (status,)] += 1
+        for key, value in values.items():
+            if value is None:
+                continue
+            histogram = _histograms.get((key, route))
+            if histogram is None:
+                histogram = _histograms[key, route] = Histogram(
+                    HISTOGRAMS[key][2])
+            histogram.observe(value)
+
+
+@contextmanager
+def measure_serialization(request):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        # The middleware only sees the Django request behind a DRF one.
+        request = getattr(request, '_request', request)
+        request.metrics_serialize_time = (
+            getattr(request, 'metrics_serialize_time', 0)
+            + time.perf_counter() - started)
+
+
+class MeasuredListModelMixin(mixins.ListModelMixin):
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            with measure_serialization(request):
+                data = serializer.data
+            return self.get_paginated_response(data)
+        serializer = self.get_serializer(queryset, many=True)
+        with measure_serialization(request):
+            data = serializer.data
+        return Response(data)
+
+
+class MeasuredRetrieveModelMixin(mixins.RetrieveModelMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        with measure_serialization(request):
+            data = serializer.data
+        return Response(data)
+
+
+class MeasuredReadMixin(MeasuredRetrieveModelMixin, MeasuredListModelMixin):
+    pass
+
+
+def reset_metrics():
+    with _lock:
+        _histograms.clear()
+        _requests.clear()
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"'
+                    for name, value in zip(names, values))
+
+
+def _header(name, help_text, kind):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+
+
+def render_metrics():
+    with _lock:
+        histograms = sorted(
+            (key, list(histogram.cumulative()), histogram.sum,
+             histogram.count)
+            for key, histogram in _histograms.items())
+        requests = sorted(_requests.items())
+    lines = _header('api_requests_total', 'Requests served.', 'counter')
+    lines.extend(
+        f'api_requests_total{{{_labels(ROUTE_LABELS + ("status",), key)}}} '
+        f'{count}' for key, count in requests)
+    for key, (name, help_text, _) in HISTOGRAMS.items():
+        lines.extend(_header(name, help_text, 'histogram'))
+        for (kind, route), buckets, total, count in histograms:
+            if kind != key:
+                continue
+            labels = _labels(ROUTE_LABELS, route)
+            lines.extend(f'{name}_bucket{{{labels},le="{bound}"}} {value}'
+                         for bound, value in buckets)
+            lines.append(f'{name}_sum{{{labels}}} {total}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+    cache_stats = get_stats()
+    for outcome in ('hits', 'misses'):
+        name = f'api_cache_{outcome}_total'
+        lines.extend(_header(name, f'Response cache {outcome}.', 'counter'))
+        lines.extend(
+            f'{name}{{namespace="{_escape(namespace)}"}} {stats[outcome]}'
+            for namespace, stats in cache_stats.items())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,101 @@
+import heapq
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import observe
+
+logger = logging.getLogger('api.metrics')
+
+UNRESOLVED = ('unresolved', '')
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - started, sql))
+
+    @property
+    def total_time(self):
+        return sum(duration for duration, _ in self.queries)
+
+    def slowest(self, count):
+        return heapq.nlargest(count, self.queries, key=lambda query: query[0])
+
+
+def get_route(request, view_func):
+    view_class = (getattr(view_func, 'cls', None)
+                  or getattr(view_func, 'view_class', None))
+    if view_class is None:
+        return request.resolver_match.view_name, ''
+    actions = getattr(view_func, 'actions', None) or {}
+    return view_class.__name__, actions.get(request.method.lower(), '')
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # Reads may go to a replica, so every alias is recorded.
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        route = getattr(request, 'metrics_route', UNRESOLVED) + (
+            request.method,)
+        observe(
+            route, response.status_code,
+            duration=duration,
+            queries=len(recorder.queries),
+            db_time=recorder.total_time,
+            serialize_time=getattr(request, 'metrics_serialize_time', None),
+            render_time=getattr(request, 'metrics_render_time', None),
+            size=None if response.streaming else len(response.content),
+        )
+        if (duration * 1000 >= settings.METRICS_SLOW_REQUEST_MS
+                or len(recorder.queries)
+                >= settings.METRICS_SLOW_REQUEST_QUERIES):
+            self.log_slow_request(request, route, duration, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_route = get_route(request, view_func)
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.metrics_render_time = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def log_slow_request(request, route, duration, recorder):
+        slowest = recorder.slowest(settings.METRICS_SLOW_QUERIES_LOGGED)
+        logger.warning(
+            'Slow request %s %s (%s.%s): %.1f ms, %d queries, %.1f ms in '
+            'SQL%s',
+            request.method, request.get_full_path(), route[0], route[1],
+            duration * 1000, len(recorder.queries),
+            recorder.total_time * 1000,
+            ''.join(f'\n  {query_time * 1000:.1f} ms: {sql}'
+                    for query_time, sql in slowest),
+        )
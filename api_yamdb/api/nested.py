@@ -0,0 +1,40 @@
+from rest_framework.generics import get_object_or_404
+
+
+class NestedResourceMixin:
+    # Maps lookups on the parent model to URL kwargs. Every parent in the
+    # URL is checked by the same query, so a mismatched chain is a 404.
+    parent_queryset = None
+    parent_field = None
+    parent_lookups = {}
+    parent_cache_attr = 'nested_parent'
+
+    def get_parent_queryset(self):
+        return self.parent_queryset.all()
+
+    def get_parent_kwargs(self, prefix=''):
+        return {
+            prefix + field: self.kwargs.get(url_kwarg)
+            for field, url_kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent(self):
+        parent = getattr(self.request, self.parent_cache_attr, None)
+        if parent is None:
+            parent = get_object_or_404(
+                self.get_parent_queryset(), **self.get_parent_kwargs())
+            setattr(self.request, self.parent_cache_attr, parent)
+        return parent
+
+    def filter_by_parent(self, queryset):
+        if self.detail:
+            # The object is loaded together with its parent in one query.
+            return queryset.select_related(self.parent_field).filter(
+                **self.get_parent_kwargs(self.parent_field + '__'))
+        return queryset.filter(**{self.parent_field: self.get_parent()})
+
+    def get_object(self):
+        obj = super().get_object()
+        setattr(self.request, self.parent_cache_attr,
+                getattr(obj, self.parent_field))
+        return obj
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+PAGE_MODE = 'page'
+CURSOR_MODE = 'cursor'
+
+
+class KeysetCursorPagination(CursorPagination):
+    ordering = ('id',)
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class StoredCountPaginator(Paginator):
+
+    def __init__(self, object_list, per_page, stored_count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.stored_count = stored_count
+
+    @cached_property
+    def count(self):
+        if self.stored_count is None:
+            return super().count
+        return self.stored_count
+
+    def page(self, number):
+        if self.stored_count is None:
+            return super().page(number)
+        # The stored counters are kept on every write, including cascades.
+        # Should one drift anyway, pages past it are reported as missing
+        # until `recalculate_ratings` rebuilds it.
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class NestedResourcePagination(PageNumberPagination):
+    mode_query_param = 'pagination'
+    cursor_pagination_class = KeysetCursorPagination
+
+    def get_mode(self, request):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param in request.query_params:
+            return CURSOR_MODE
+        return request.query_params.get(
+            self.mode_query_param, settings.NESTED_PAGINATION_MODE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.get_mode(request) == CURSOR_MODE:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+        get_stored_count = getattr(view, 'get_stored_count', None)
+        self.stored_count = get_stored_count() if get_stored_count else None
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return StoredCountPaginator(object_list, per_page,
+                                    stored_count=self.stored_count)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
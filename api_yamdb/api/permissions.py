@@ -16,7 +16,7 @@ class IsAuthorOrModeratorOrAdmin(permissions.BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return (obj.author == request.user or (
+        return (obj.author_id == request.user.pk or (
             request.user.role in [Roles.MODERATOR, Roles.ADMIN]))
 
 
@@ -0,0 +1,78 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+
+def _relation(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not field.is_relation:
+        return None
+    return field
+
+
+def _plan_field(field, relation, lookup, select, prefetch):
+    if isinstance(field, serializers.ListSerializer):
+        prefetch.add(lookup)
+        _walk(field.child, relation.related_model, lookup + '__',
+              prefetch, prefetch)
+    elif isinstance(field, serializers.BaseSerializer):
+        select.add(lookup)
+        _walk(field, relation.related_model, lookup + '__',
+              select, prefetch)
+    elif isinstance(field, ManyRelatedField):
+        prefetch.add(lookup)
+    elif (isinstance(field, serializers.RelatedField)
+          and not field.use_pk_only_optimization()):
+        select.add(lookup)
+
+
+def _walk(serializer, model, prefix, select, prefetch):
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        path = field.source.split('.')
+        current_model, current_prefix = model, prefix
+        for name in path[:-1]:
+            relation = _relation(current_model, name)
+            if relation is None:
+                break
+            lookup = current_prefix + name
+            if relation.many_to_many or relation.one_to_many:
+                prefetch.add(lookup)
+            else:
+                select.add(lookup)
+            current_model = relation.related_model
+            current_prefix = lookup + '__'
+        else:
+            relation = _relation(current_model, path[-1])
+            if relation is not None:
+                _plan_field(field, relation, current_prefix + path[-1],
+                            select, prefetch)
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class, model):
+    select, prefetch = set(), set()
+    _walk(serializer_class(), model, '', select, prefetch)
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+def plan_queryset(queryset, serializer_class):
+    select, prefetch = get_query_plan(serializer_class, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class QueryPlanMixin:
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return plan_queryset(queryset, self.get_serializer_class())
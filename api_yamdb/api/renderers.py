@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+                  if orjson is not None else 0)
+
+
+class FastJSONRenderer(JSONRenderer):
+    # Same output as JSONRenderer with the compact, unicode defaults.
+    # orjson serializes datetimes, UUIDs and containers itself, everything
+    # else (Decimal, lazy strings, querysets) goes through the DRF encoder.
+
+    def is_fast(self, accepted_media_type, renderer_context):
+        return (orjson is not None and self.compact and not self.ensure_ascii
+                and self.encoder_class is encoders.JSONEncoder
+                and not self.get_indent(accepted_media_type,
+                                        renderer_context))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.is_fast(accepted_media_type,
+                                            renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and other values orjson refuses.
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes the separators that are invalid in JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029')
@@ -4,13 +4,17 @@ from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from api_yamdb.settings import LEN_MAX, NUMBER_OF_VALUES
+from api_yamdb.settings import LEN_MAX, LEN_NAME_SLUG, NUMBER_OF_VALUES
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import get_median
+from reviews.search import SEARCH_INDEXES
 
 User = get_user_model()
 
 MIN_USER_NAME = 3
 MAX_USER_NAME = 30
+DEFAULT_TOP_TITLES = 10
+MAX_TOP_TITLES = 100
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -68,6 +72,12 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class BulkCategorySerializer(CategorySerializer):
+
+    class Meta(CategorySerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+
 class CategoryReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
@@ -80,16 +90,52 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class BulkGenreSerializer(GenreSerializer):
+
+    class Meta(GenreSerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+
+class TitleStatsSerializer(serializers.ModelSerializer):
+    count = serializers.IntegerField(source='reviews_count')
+    mean = serializers.FloatField(source='rating')
+    median = serializers.SerializerMethodField()
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+    class Meta:
+        model = Title
+        fields = ('count', 'mean', 'median', 'histogram')
+
+    def get_median(self, obj):
+        return get_median(obj.histogram)
+
+
 class TitleSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.IntegerField(
-        source='reviews__score__avg', read_only=True)
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description',
-                  'genre', 'category', 'rating')
+                  'genre', 'category', 'rating', 'weighted_rating',
+                  'reviews_count')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if (request is not None
+                and request.query_params.get('stats') in ('1', 'true')):
+            fields['stats'] = TitleStatsSerializer(source='*', read_only=True)
+        return fields
+
+
+class TopTitlesQuerySerializer(serializers.Serializer):
+    by = serializers.ChoiceField(
+        choices=('rating', 'weighted', 'popularity', 'year'),
+        default='rating')
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_TOP_TITLES, default=DEFAULT_TOP_TITLES)
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -103,23 +149,42 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
 
+class BulkTitleSerializer(serializers.ModelSerializer):
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=LEN_NAME_SLUG))
+    category = serializers.SlugField(max_length=LEN_NAME_SLUG)
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+
+class BulkTitleUpdateSerializer(BulkTitleSerializer):
+    id = serializers.IntegerField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=LEN_NAME_SLUG), required=False)
+    category = serializers.SlugField(max_length=LEN_NAME_SLUG, required=False)
+
+    class Meta(BulkTitleSerializer.Meta):
+        fields = ('id',) + BulkTitleSerializer.Meta.fields
+        extra_kwargs = {field: {'required': False}
+                        for field in ('name', 'year', 'description')}
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.CharField(source='author.username', read_only=True)
     title = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    default_error_messages = {
+        'duplicate': 'Вы не можете добавить более одного отзыва на '
+                     'произведение',
+    }
+
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date', 'title')
-
-    def validate(self, attrs):
-        if self.context['request'].method == 'POST':
-            title_id = self.context['view'].kwargs.get('title_id__pk')
-            title = get_object_or_404(Title, id=title_id)
-            author = self.context['request'].user
-            if Review.objects.filter(title=title, author=author).exists():
-                raise ValidationError('Вы не можете добавить более одного',
-                                      'отзыва на произведение')
-        return super().validate(attrs)
+        fields = ('id', 'text', 'author', 'score', 'pub_date', 'title',
+                  'comments_count')
+        read_only_fields = ('comments_count',)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -139,3 +204,19 @@ class TokenSerializer(serializers.Serializer):
         user = get_object_or_404(User, username=attrs.get('username'))
         if user.confirmation_code != attrs.get('confirmation_code'):
             raise ValidationError('Invalid confirmation code')
+        return attrs
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    type = serializers.MultipleChoiceField(
+        choices=list(SEARCH_INDEXES), required=False)
+
+
+class SearchHitSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    title_id = serializers.IntegerField(required=False)
+    review_id = serializers.IntegerField(required=False)
+    score = serializers.FloatField(allow_null=True)
+    snippet = serializers.CharField()
@@ -0,0 +1,79 @@
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from reviews import ratings
+from reviews.models import Comment, Review, Title
+
+from .cache import TITLES, invalidate
+
+User = get_user_model()
+
+# Objects whose deletion is in progress. Cascades send post_delete for
+# every review and comment before their parents go, so the per-row
+# receivers skip rows whose parent or author is on its way out.
+_deleted_titles = ContextVar('deleted_titles', default=frozenset())
+_deleted_reviews = ContextVar('deleted_reviews', default=frozenset())
+_deleted_authors = ContextVar('deleted_authors', default=frozenset())
+
+
+def _mark(deleted, pk):
+    deleted.set(deleted.get() | {pk})
+
+
+def _unmark(deleted, pk):
+    deleted.set(deleted.get() - {pk})
+
+
+# Reviews and comments also go away through cascades (deleting a user or a
+# review), so the stored aggregates are kept on the model signal rather
+# than in the views.
+@receiver(pre_delete, sender=Title)
+def mark_title(sender, instance, **kwargs):
+    _mark(_deleted_titles, instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def unmark_title(sender, instance, **kwargs):
+    _unmark(_deleted_titles, instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def forget_author(sender, instance, **kwargs):
+    # The user's reviews and comments are shifted out per title and per
+    # review in a few UPDATEs before the cascade deletes them.
+    if ratings.reviews_deleted(Review.objects.filter(author=instance)):
+        invalidate(TITLES)
+    ratings.comments_deleted(Comment.objects.filter(
+        author=instance).exclude(review__author=instance))
+    _mark(_deleted_authors, instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def unmark_author(sender, instance, **kwargs):
+    _unmark(_deleted_authors, instance.pk)
+
+
+@receiver(pre_delete, sender=Review)
+def mark_review(sender, instance, **kwargs):
+    _mark(_deleted_reviews, instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def forget_review(sender, instance, **kwargs):
+    _unmark(_deleted_reviews, instance.pk)
+    if (instance.title_id in _deleted_titles.get()
+            or instance.author_id in _deleted_authors.get()):
+        return
+    ratings.review_deleted(instance)
+    invalidate(TITLES)
+
+
+@receiver(post_delete, sender=Comment)
+def forget_comment(sender, instance, **kwargs):
+    if (instance.review_id in _deleted_reviews.get()
+            or instance.author_id in _deleted_authors.get()):
+        return
+    ratings.comment_deleted(instance)
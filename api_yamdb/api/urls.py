@@ -32,6 +32,12 @@ auth = [
 
 urlpatterns = [
     path('v1/auth/', include(auth)),
+    path('v1/cache/stats/', views.CacheStatsView.as_view(),
+         name='cache-stats'),
+    path('v1/export/titles/', views.TitleExportView.as_view(),
+         name='export-titles'),
+    path('v1/metrics/', views.MetricsView.as_view(), name='metrics'),
+    path('v1/search/', views.SearchView.as_view(), name='search'),
     path('v1/', include(router.urls)),
     path('v1/', include(titles_router.urls)),
     path('v1/', include(reviews_router.urls)),
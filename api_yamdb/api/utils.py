@@ -2,9 +2,8 @@ import os
 from random import choice
 from string import ascii_letters
 
-from django.core.mail import send_mail
-
 from api_yamdb.settings import FROM_EMAIL
+from core.outbox import enqueue_email
 
 
 def get_confirmation_code():
@@ -15,4 +14,4 @@ def send_confirmation_code(email, code):
     subject = 'Your Confirmation Code'
     message = f'Your confirmation code is: {code}'
     from_email = os.getenv(FROM_EMAIL)
-    send_mail(subject, message, from_email, [email], fail_silently=False)
+    enqueue_email(subject, message, email, from_email)
@@ -1,11 +1,11 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters,
                             mixins,
@@ -14,24 +14,46 @@ from rest_framework import (filters,
                             status,
                             viewsets)
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
 
+from reviews import ratings
 from reviews.models import Category, Comment, Genre, Review, Title
-
-from .filters import TitleFilter
+from reviews.search import SEARCH_INDEXES, get_backend
+
+from .bulk import (BulkCategoryWriteMixin,
+                   BulkGenreWriteMixin,
+                   BulkTitleWriteMixin)
+from .cache import (CATEGORIES, GENRES, TITLES, CachedListMixin,
+                    get_or_build, get_stats, invalidate)
+from .compiled import CompiledReadMixin
+from .conditional import ConditionalGetMixin
+from .export import IgnoreClientContentNegotiation, stream_csv, stream_jsonl
+from .filters import FullTextSearchFilter, StableOrderingFilter, TitleFilter
+from .metrics import (MeasuredListModelMixin, MeasuredReadMixin,
+                      measure_serialization, render_metrics)
+from .nested import NestedResourceMixin
+from .pagination import NestedResourcePagination
 from .permissions import (IsAdminOrSuperUser,
                           IsAuthorOrModeratorOrAdmin,
                           IsSafeMethod)
+from .query_plans import QueryPlanMixin, plan_queryset
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
+    SearchHitSerializer,
+    SearchQuerySerializer,
     SignUpSerializer,
     TitleSerializer,
+    TitleStatsSerializer,
     TitleWriteSerializer,
+    TopTitlesQuerySerializer,
     TokenSerializer,
     UserSerializer,
 )
@@ -60,17 +82,14 @@ class SignUpView(APIView):
 class TokenView(APIView):
     permission_classes = [permissions.AllowAny]
 
+    @staticmethod
     def get_token(user):
-        access_payload = {
-            'iss': 'api_yamdb',
-            'role': user.role,
-            'username': user.username,
-            'exp': datetime.utcnow() + timedelta(
-                seconds=settings.JWT_ACCESS_TTL),
-            'type': 'access'
-        }
-        access = jwt.encode(payload=access_payload, key=settings.SECRET_KEY)
-        return {'access': access}
+        access = AccessToken.for_user(user)
+        access.set_exp(lifetime=timedelta(seconds=settings.JWT_ACCESS_TTL))
+        access['role'] = user.role
+        access['username'] = user.username
+        access['is_superuser'] = user.is_superuser
+        return {'access': str(access)}
 
     def post(self, request, format=None):
         serializer = TokenSerializer(data=request.data)
@@ -80,7 +99,61 @@ class TokenView(APIView):
             'token': self.get_token(user)}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class TitleExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated & IsAdminOrSuperUser]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    formats = {
+        'jsonl': (stream_jsonl, 'application/x-ndjson'),
+        'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    }
+
+    def get(self, request):
+        file_format = request.query_params.get('file_format', 'jsonl')
+        if file_format not in self.formats:
+            return Response(
+                {'file_format': [f'Supported: {", ".join(self.formats)}.']},
+                status=status.HTTP_400_BAD_REQUEST)
+        stream, content_type = self.formats[file_format]
+        response = StreamingHttpResponse(stream(), content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{file_format}"')
+        return response
+
+
+class CacheStatsView(APIView):
+    permission_classes = [permissions.IsAuthenticated & IsAdminOrSuperUser]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class MetricsView(APIView):
+    permission_classes = [permissions.IsAuthenticated & IsAdminOrSuperUser]
+
+    def get(self, request):
+        return HttpResponse(
+            render_metrics(),
+            content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class SearchView(APIView):
+    permission_classes = [permissions.AllowAny]
+    pagination_class = PageNumberPagination
+
+    def get(self, request):
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        types = serializer.validated_data.get('type') or SEARCH_INDEXES
+        results = get_backend().search(
+            serializer.validated_data['q'],
+            [kind for kind in SEARCH_INDEXES if kind in types])
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(results, request, view=self)
+        return paginator.get_paginated_response(
+            SearchHitSerializer(page, many=True).data)
+
+
+class UserViewSet(MeasuredReadMixin, viewsets.ModelViewSet):
     http_method_names = ['get',
                          'post',
                          'head',
@@ -113,12 +186,16 @@ class UserViewSet(viewsets.ModelViewSet):
 
 class CreateDeleteListViewSet(mixins.CreateModelMixin,
                               mixins.DestroyModelMixin,
-                              mixins.ListModelMixin,
+                              MeasuredListModelMixin,
                               viewsets.GenericViewSet):
     pass
 
 
-class CategoryViewSet(CreateDeleteListViewSet):
+class CategoryViewSet(BulkCategoryWriteMixin,
+                      CachedListMixin,
+                      CreateDeleteListViewSet):
+    cache_namespace = CATEGORIES
+    invalidates_cache = (CATEGORIES, TITLES)
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
     permission_classes = [
@@ -127,8 +204,17 @@ class CategoryViewSet(CreateDeleteListViewSet):
     search_fields = ['name']
     lookup_field = 'slug'
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.titles.update(modified=timezone.now())
+            super().perform_destroy(instance)
 
-class GenreViewSet(CreateDeleteListViewSet):
+
+class GenreViewSet(BulkGenreWriteMixin,
+                   CachedListMixin,
+                   CreateDeleteListViewSet):
+    cache_namespace = GENRES
+    invalidates_cache = (GENRES, TITLES)
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
     filter_backends = [filters.SearchFilter]
@@ -137,14 +223,35 @@ class GenreViewSet(CreateDeleteListViewSet):
     permission_classes = [
         IsSafeMethod | (permissions.IsAuthenticated & IsAdminOrSuperUser)]
 
-
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')).order_by('name')
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.titles.update(modified=timezone.now())
+            super().perform_destroy(instance)
+
+
+class TitleViewSet(BulkTitleWriteMixin,
+                   ConditionalGetMixin,
+                   CachedListMixin,
+                   QueryPlanMixin,
+                   CompiledReadMixin,
+                   MeasuredReadMixin,
+                   viewsets.ModelViewSet):
+    cache_namespace = TITLES
+    invalidates_cache = (TITLES,)
+    queryset = Title.objects.all().order_by('name')
     serializer_class = TitleSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [FullTextSearchFilter, DjangoFilterBackend,
+                       StableOrderingFilter]
     filterset_class = TitleFilter
+    ordering_fields = ('name', 'year', 'rating', 'weighted_rating',
+                       'reviews_count')
+    top_orderings = {
+        'rating': ('-rating', '-reviews_count', '-id'),
+        'weighted': ('-weighted_rating', '-reviews_count', '-id'),
+        'popularity': ('-reviews_count', '-rating', '-id'),
+        'year': ('-year', '-rating', '-id'),
+    }
     pagination_class = PageNumberPagination
     permission_classes = [
         IsSafeMethod | (permissions.IsAuthenticated & IsAdminOrSuperUser)]
@@ -152,14 +259,51 @@ class TitleViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return TitleWriteSerializer
+        if self.action == 'stats':
+            return TitleStatsSerializer
         return TitleSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        params = TopTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filterset = TitleFilter(
+            request.query_params, queryset=Title.objects.all())
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return Response(get_or_build(
+            TITLES, request,
+            lambda: self.get_top(filterset.qs, **params.validated_data),
+            settings.TOP_TITLES_CACHE_TIMEOUT))
+
+    def get_top(self, titles, by, limit):
+        ordering = self.top_orderings[by]
+        if by in ('rating', 'weighted'):
+            titles = titles.filter(**{f'{ordering[0][1:]}__isnull': False})
+        titles = plan_queryset(titles.order_by(*ordering), TitleSerializer)
+        serializer = self.get_serializer(titles[:limit], many=True)
+        with measure_serialization(self.request):
+            return serializer.data
+
+
+class ReviewViewSet(ConditionalGetMixin,
+                    NestedResourceMixin,
+                    QueryPlanMixin,
+                    CompiledReadMixin,
+                    MeasuredReadMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     http_method_names = ['get', 'post', 'delete', 'patch']
-    filter_backends = [DjangoFilterBackend, ]
-    pagination_class = PageNumberPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+    pagination_class = NestedResourcePagination
+    cursor_ordering = ('id',)
+    parent_queryset = Title.objects.all()
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id__pk'}
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -168,24 +312,61 @@ class ReviewViewSet(viewsets.ModelViewSet):
             self.permission_classes = [IsAuthorOrModeratorOrAdmin]
         return super().get_permissions()
 
+    def get_conditional_queryset(self):
+        reviews = self.filter_by_parent(Review.objects.all())
+        if self.action == 'list':
+            return reviews
+        return reviews.filter(pk=self.kwargs.get('pk'))
+
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id__pk')
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all().order_by('id',)
+        return self.filter_by_parent(Review.objects.all()).order_by('id',)
+
+    def get_stored_count(self):
+        if self.request.query_params.get(FullTextSearchFilter.search_param):
+            return None
+        return self.get_parent().reviews_count
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id__pk')
-        title = get_object_or_404(Title, id=title_id)
+        title = self.get_parent()
         user = self.request.user
-        serializer.save(author=user, title=title)
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        try:
+            # Saving by id keeps reads of the lazy token user out of the
+            # transaction, so it takes the write lock with its first query.
+            with transaction.atomic():
+                review = serializer.save(author_id=user.pk, title=title)
+                ratings.review_created(review)
+                invalidate(TITLES)
+        except IntegrityError:
+            # Duplicates are left to the unique constraint, a check before
+            # the insert costs a query and still races with other requests.
+            if not Review.objects.filter(
+                    title=title, author_id=user.pk).exists():
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                serializer.error_messages['duplicate']]}, code='duplicate')
+
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        with transaction.atomic():
+            review = serializer.save()
+            ratings.review_updated(review, old_score)
+            invalidate(TITLES)
+
+
+class CommentViewSet(ConditionalGetMixin,
+                     NestedResourceMixin,
+                     QueryPlanMixin,
+                     CompiledReadMixin,
+                     MeasuredReadMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
-    get_queryset = Comment.objects.all()
     http_method_names = ['get', 'post', 'delete', 'patch']
-    filter_backends = [DjangoFilterBackend, ]
-    pagination_class = PageNumberPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+    pagination_class = NestedResourcePagination
+    cursor_ordering = ('id',)
+    parent_queryset = Review.objects.all()
+    parent_field = 'review'
+    parent_lookups = {'pk': 'review__pk', 'title_id': 'title_id__pk'}
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -194,13 +375,22 @@ class CommentViewSet(viewsets.ModelViewSet):
             self.permission_classes = [IsAuthorOrModeratorOrAdmin]
         return super().get_permissions()
 
+    def get_conditional_queryset(self):
+        comments = self.filter_by_parent(Comment.objects.all())
+        if self.action == 'list':
+            return comments
+        return comments.filter(pk=self.kwargs.get('pk'))
+
     def get_queryset(self):
-        review_id = self.kwargs.get('review__pk', None)
-        review = get_object_or_404(Review, pk=review_id)
-        return review.comments.all().order_by('id',)
+        return self.filter_by_parent(Comment.objects.all()).order_by('id',)
+
+    def get_stored_count(self):
+        if self.request.query_params.get(FullTextSearchFilter.search_param):
+            return None
+        return self.get_parent().comments_count
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review__pk', None)
-        review = get_object_or_404(Review, pk=review_id)
         user = self.request.user
-        serializer.save(review=review, author=user)
+        with transaction.atomic():
+            comment = serializer.save(review=self.get_parent(), author=user)
+            ratings.comment_created(comment)
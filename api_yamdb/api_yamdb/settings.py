@@ -15,10 +15,29 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 
 JWT_ACCESS_TTL = 60 * 5
 
+RATING_PRIOR_MEAN = float(os.getenv('RATING_PRIOR_MEAN', 5.5))
+RATING_PRIOR_WEIGHT = float(os.getenv('RATING_PRIOR_WEIGHT', 10))
+JWT_USER_STATE_TTL = int(os.getenv('JWT_USER_STATE_TTL', 30))
+
+NESTED_PAGINATION_MODE = os.getenv('NESTED_PAGINATION_MODE', 'page')
+
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND',
+                           'reviews.search.SQLiteFTS5Backend')
+
 FROM_EMAIL = os.getenv('FROM_EMAIL')
 
 DEBUG = os.getenv("DEBUG", 'False').lower() in ('true', '1', 't')
 
+# Development setups write mail to files, tests get pytest-django's locmem.
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', (
+    'django.core.mail.backends.filebased.EmailBackend' if DEBUG
+    else 'django.core.mail.backends.smtp.EmailBackend'))
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF = 30
+EMAIL_OUTBOX_MAX_BACKOFF = 60 * 60
+EMAIL_OUTBOX_LEASE = 60 * 5
+
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS').split(', ')
 
 INSTALLED_APPS = [
@@ -38,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,12 +89,65 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+CONN_MAX_AGE = int(os.getenv('CONN_MAX_AGE', 60))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+    }
+}
+
+for number, replica in enumerate(
+        filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica_{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': replica.strip(),
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'TEST': {'MIRROR': 'default'},
     }
+
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'memory'),
 }
+if os.getenv('SQLITE_TUNING', 'True').lower() not in ('true', '1', 't'):
+    SQLITE_PRAGMAS = {}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+REPLICA_HEALTH_CHECK_INTERVAL = int(
+    os.getenv('REPLICA_HEALTH_CHECK_INTERVAL', 10))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    }
+}
+
+API_CACHE_ALIAS = os.getenv('API_CACHE_ALIAS', 'default')
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 60 * 5))
+TOP_TITLES_CACHE_TIMEOUT = int(os.getenv('TOP_TITLES_CACHE_TIMEOUT', 30))
+BULK_WRITE_MAX_ITEMS = int(os.getenv('BULK_WRITE_MAX_ITEMS', 10000))
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 16))
+COMPILED_SERIALIZERS = os.getenv('COMPILED_SERIALIZERS', 'True').lower() in (
+    'true', '1', 't')
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() in (
+    'true', '1', 't')
+METRICS_SLOW_REQUEST_MS = int(os.getenv('METRICS_SLOW_REQUEST_MS', 500))
+METRICS_SLOW_REQUEST_QUERIES = int(
+    os.getenv('METRICS_SLOW_REQUEST_QUERIES', 50))
+METRICS_SLOW_QUERIES_LOGGED = int(
+    os.getenv('METRICS_SLOW_QUERIES_LOGGED', 3))
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -107,8 +181,17 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
@@ -0,0 +1,107 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+
+
+class ReadState:
+
+    def __init__(self):
+        self.alias = None
+
+
+_read_state = ContextVar('replica_read_state', default=None)
+
+
+@contextmanager
+def replica_reads():
+    token = _read_state.set(ReadState())
+    try:
+        yield
+    finally:
+        _read_state.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    token = _read_state.set(None)
+    try:
+        yield
+    finally:
+        _read_state.reset(token)
+
+
+class ReplicaPool:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0
+        self._checked = {}
+
+    def reset(self):
+        with self._lock:
+            self._next = 0
+            self._checked.clear()
+
+    def choose(self, aliases):
+        with self._lock:
+            start = self._next
+            self._next += 1
+        for offset in range(len(aliases)):
+            alias = aliases[(start + offset) % len(aliases)]
+            if self.is_healthy(alias):
+                return alias
+        return None
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(alias)
+        if (checked is not None
+                and now - checked[0] < settings.REPLICA_HEALTH_CHECK_INTERVAL):
+            return checked[1]
+        healthy = self.ping(alias)
+        with self._lock:
+            self._checked[alias] = (now, healthy)
+        return healthy
+
+    @staticmethod
+    def ping(alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+            return True
+        except DatabaseError:
+            connection.close()
+            return False
+
+
+replicas = ReplicaPool()
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        if (state is None or not settings.DATABASE_REPLICAS
+                or connections[PRIMARY].in_atomic_block):
+            return PRIMARY
+        if state.alias is None:
+            state.alias = (replicas.choose(settings.DATABASE_REPLICAS)
+                           or PRIMARY)
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
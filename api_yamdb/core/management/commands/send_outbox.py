@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import (claim_batch, close_connections, deliver,
+                         record_results)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_WORKERS = 4
+DEFAULT_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = ('Deliver queued emails in batches over reused mail connections '
+            'with retries and exponential backoff.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+        parser.add_argument(
+            '--interval', type=float, default=DEFAULT_INTERVAL,
+            help='Seconds to sleep when the queue is empty.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit as soon as no due messages are left.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                self.drain(pool, workers, options)
+            finally:
+                close_connections()
+
+    def drain(self, pool, workers, options):
+        while True:
+            batches = []
+            for _ in range(workers):
+                batch = claim_batch(options['batch_size'])
+                if not batch:
+                    break
+                batches.append(batch)
+            if not batches:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+            for results in pool.map(deliver, batches):
+                sent, failed = record_results(results)
+                self.stdout.write(f'Sent {sent}, failed {failed}.')
@@ -0,0 +1,69 @@
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .db_routers import replica_reads
+
+PIN_COOKIE = 'primary_until'
+
+
+def _pin_key(user_id):
+    return f'replica:pin:{user_id}'
+
+
+def get_token_user_id(request):
+    # Only the signature is checked here; the view still authenticates.
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def is_pinned(request):
+    try:
+        if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    # Clients that only send a token and drop cookies are pinned by user.
+    user_id = get_token_user_id(request)
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+def pin(request, response):
+    seconds = settings.REPLICA_PIN_SECONDS
+    response.set_cookie(PIN_COOKIE, str(time.time() + seconds),
+                        max_age=seconds, httponly=True, samesite='Lax')
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), True, seconds)
+
+
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        reads = (replica_reads() if safe and settings.DATABASE_REPLICAS
+                 and not is_pinned(request) else nullcontext())
+        with reads:
+            response = self.get_response(request)
+        if (not safe and settings.DATABASE_REPLICAS
+                and response.status_code < 400):
+            # Keep this client on the primary until replicas catch up.
+            pin(request, response)
+        return response
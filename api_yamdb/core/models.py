@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+from api_yamdb.settings import LEN_MAX, NUMBER_OF_VALUES
+
+MAX_LEN_STATUS = 10
+
+
+class OutgoingEmail(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        SENT = 'sent'
+        FAILED = 'failed'
+
+    subject = models.CharField(max_length=LEN_MAX)
+    body = models.TextField()
+    from_email = models.CharField(max_length=NUMBER_OF_VALUES, blank=True)
+    to = models.EmailField(max_length=NUMBER_OF_VALUES)
+    status = models.CharField(max_length=MAX_LEN_STATUS,
+                              choices=Status.choices,
+                              default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'],
+                         name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.to}'
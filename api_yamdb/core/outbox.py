@@ -0,0 +1,127 @@
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject, body=body, to=to, from_email=from_email or '')
+
+
+def claim_batch(size):
+    now = timezone.now()
+    due = (OutgoingEmail.objects
+           .filter(status=OutgoingEmail.Status.PENDING,
+                   next_attempt_at__lte=now)
+           .order_by('next_attempt_at', 'id'))
+    if connection.features.has_select_for_update_skip_locked:
+        due = due.select_for_update(skip_locked=True)
+    lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    with transaction.atomic():
+        batch = list(due[:size])
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=lease)
+    return batch
+
+
+def _get_connection():
+    if getattr(_local, 'connection', None) is None:
+        smtp = get_connection(fail_silently=False)
+        smtp.open()
+        with _connections_lock:
+            _connections.append(smtp)
+        _local.connection = smtp
+    return _local.connection
+
+
+def _close(smtp):
+    try:
+        smtp.close()
+    except Exception:
+        pass
+
+
+def _drop_connection():
+    smtp = getattr(_local, 'connection', None)
+    _local.connection = None
+    if smtp is not None:
+        with _connections_lock:
+            if smtp in _connections:
+                _connections.remove(smtp)
+        _close(smtp)
+
+
+def _send(message):
+    reused = getattr(_local, 'connection', None) is not None
+    try:
+        _get_connection().send_messages([message])
+    except Exception:
+        _drop_connection()
+        if not reused:
+            raise
+        # The server may have closed the idle connection, that is not the
+        # message's fault, so it gets one more try on a fresh connection.
+        try:
+            _get_connection().send_messages([message])
+        except Exception:
+            _drop_connection()
+            raise
+
+
+def deliver(batch):
+    results = []
+    for email in batch:
+        message = EmailMessage(email.subject, email.body,
+                               email.from_email or None, [email.to])
+        try:
+            _send(message)
+        except Exception as error:
+            results.append((email, repr(error)))
+        else:
+            results.append((email, None))
+    return results
+
+
+def close_connections():
+    with _connections_lock:
+        connections = _connections[:]
+        _connections.clear()
+    for smtp in connections:
+        _close(smtp)
+
+
+def retry_delay(attempts):
+    return min(settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1),
+               settings.EMAIL_OUTBOX_MAX_BACKOFF)
+
+
+def record_results(results):
+    now = timezone.now()
+    sent = [email.pk for email, error in results if error is None]
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        status=OutgoingEmail.Status.SENT, sent_at=now,
+        attempts=F('attempts') + 1, last_error='')
+    for email, error in results:
+        if error is None:
+            continue
+        attempts = email.attempts + 1
+        if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            status = OutgoingEmail.Status.FAILED
+        else:
+            status = OutgoingEmail.Status.PENDING
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            status=status, attempts=attempts, last_error=error,
+            next_attempt_at=now + timedelta(seconds=retry_delay(attempts)))
+    return len(sent), len(results) - len(sent)
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from .search import prepare_search_connection, repair_search_index
+
+        post_migrate.connect(repair_search_index, sender=self)
+        connection_created.connect(prepare_search_connection)
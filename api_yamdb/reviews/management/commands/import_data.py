@@ -0,0 +1,223 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment, Genre,
+                            Review, Title)
+from reviews.ratings import (recalculate_comment_counts, recalculate_ratings,
+                             update_weighted_ratings)
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 5000
+FORMATS = ('csv', 'jsonl')
+
+
+@contextmanager
+def preserve_timestamps(model):
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as source:
+        yield from csv.DictReader(source)
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+class Command(BaseCommand):
+    help = ('Bulk import categories, genres, titles, genre links, users, '
+            'reviews and comments from CSV or JSON-lines files.')
+
+    sources = (
+        ('category', Category),
+        ('genre', Genre),
+        ('titles', Title),
+        ('genre_title', Title.genre.through),
+        ('users', User),
+        ('review', Review),
+        ('comments', Comment),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Directory with category, genre, titles, '
+                         'genre_title, users, review and comments files.')
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--batch-size', type=int,
+                            default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--only', nargs='+', choices=[name for name, _ in self.sources],
+            help='Import only the listed files.')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Skip rows that violate unique constraints.')
+
+    def handle(self, *args, **options):
+        directory = Path(options['path'])
+        if not directory.is_dir():
+            raise CommandError(f'{directory} is not a directory.')
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.keys = {}
+        reader = READERS[options['format']]
+        imported = set()
+        for name, model in self.sources:
+            if options['only'] and name not in options['only']:
+                continue
+            path = directory / f'{name}.{options["format"]}'
+            if not path.exists():
+                continue
+            build = getattr(self, f'build_{name}')
+            self.import_file(path, model, build, reader)
+            imported.add(name)
+        if imported & {'titles', 'review'}:
+            recalculate_ratings(batch_size=self.batch_size)
+            update_weighted_ratings(batch_size=self.batch_size)
+        if imported & {'review', 'comments'}:
+            recalculate_comment_counts(batch_size=self.batch_size)
+
+    def import_file(self, path, model, build, reader):
+        started = time.monotonic()
+        total = 0
+        batch = []
+        with preserve_timestamps(model):
+            for line, row in enumerate(reader(path), 2):
+                try:
+                    batch.append(build(row))
+                except (KeyError, ValueError) as error:
+                    raise CommandError(f'{path}:{line}: {error!r}')
+                if len(batch) >= self.batch_size:
+                    total += self.write(model, batch)
+                    batch = []
+            if batch:
+                total += self.write(model, batch)
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            f'{path.name}: {total} rows in {elapsed:.2f}s '
+            f'({total / elapsed:.0f} rows/s)')
+
+    def write(self, model, objects):
+        with transaction.atomic():
+            model.objects.bulk_create(
+                objects, batch_size=self.batch_size,
+                ignore_conflicts=self.ignore_conflicts)
+        return len(objects)
+
+    def remember(self, kind, obj, natural_key):
+        if obj.pk is not None:
+            self.keys.setdefault(kind, {})[natural_key] = int(obj.pk)
+
+    def resolve(self, kind, model, field, value):
+        value = str(value).strip()
+        keys = self.keys.setdefault(kind, {})
+        if value not in keys:
+            keys.update(model.objects.filter(**{field: value})
+                        .values_list(field, 'pk'))
+        if value not in keys:
+            raise ValueError(f'unknown {kind} {value!r}')
+        return keys[value]
+
+    def reference(self, row, name, kind, model, field, required=True):
+        # Ids come only from `<name>_id` columns: a slug or a username made
+        # of digits is still a natural key.
+        pk = row.get(f'{name}_id')
+        if pk not in (None, ''):
+            return int(pk)
+        value = row.get(name)
+        if value not in (None, ''):
+            return self.resolve(kind, model, field, value)
+        if required:
+            raise ValueError(f'missing {name}')
+        return None
+
+    def build_category(self, row):
+        obj = Category(pk=row.get('id') or None, name=row['name'],
+                       slug=row['slug'])
+        self.remember('category', obj, obj.slug)
+        return obj
+
+    def build_genre(self, row):
+        obj = Genre(pk=row.get('id') or None, name=row['name'],
+                    slug=row['slug'])
+        self.remember('genre', obj, obj.slug)
+        return obj
+
+    def build_titles(self, row):
+        return Title(pk=row.get('id') or None, name=row['name'],
+                     year=int(row['year']),
+                     description=row.get('description') or '',
+                     category_id=self.reference(
+                         row, 'category', 'category', Category, 'slug',
+                         required=False))
+
+    def build_genre_title(self, row):
+        return Title.genre.through(
+            pk=row.get('id') or None,
+            title_id=int(row.get('title_id') or row['title']),
+            genre_id=self.reference(row, 'genre', 'genre', Genre, 'slug'))
+
+    def build_users(self, row):
+        obj = User(pk=row.get('id') or None, username=row['username'],
+                   email=row['email'],
+                   role=row.get('role') or User.Roles.USER,
+                   bio=row.get('bio') or '',
+                   first_name=row.get('first_name') or '',
+                   last_name=row.get('last_name') or '',
+                   password=make_password(None))
+        self.remember('users', obj, obj.username)
+        return obj
+
+    def parse_pub_date(self, row):
+        value = row.get('pub_date')
+        if not value:
+            return timezone.now()
+        pub_date = parse_datetime(value)
+        if pub_date is None:
+            raise ValueError(f'invalid pub_date {value!r}')
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date, timezone.utc)
+        return pub_date
+
+    def build_review(self, row):
+        score = int(row['score'])
+        if not MIN_SCORE <= score <= MAX_SCORE:
+            raise ValueError(f'score {score} is out of range')
+        return Review(pk=row.get('id') or None, text=row['text'],
+                      score=score,
+                      title_id=int(row.get('title_id') or row['title']),
+                      author_id=self.reference(row, 'author', 'users', User,
+                                               'username'),
+                      pub_date=self.parse_pub_date(row))
+
+    def build_comments(self, row):
+        return Comment(pk=row.get('id') or None, text=row['text'],
+                       review_id=int(row.get('review_id') or row['review']),
+                       author_id=self.reference(row, 'author', 'users', User,
+                                                'username'),
+                       pub_date=self.parse_pub_date(row))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.ratings import (RATING_BATCH_SIZE, find_stale_comment_counts,
+                             find_stale_ratings, recalculate_comment_counts,
+                             recalculate_ratings, update_weighted_ratings)
+
+
+class Command(BaseCommand):
+    help = ('Rebuild stored title ratings and review comment counts or '
+            'verify them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report titles whose stored rating is stale.')
+        parser.add_argument(
+            '--batch-size', type=int, default=RATING_BATCH_SIZE,
+            help='Number of titles updated per transaction.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            self.check_aggregates()
+            return
+        updated = recalculate_ratings(batch_size=options['batch_size'])
+        reviews = recalculate_comment_counts(batch_size=options['batch_size'])
+        update_weighted_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Recalculated ratings for {updated} title(s) and comment '
+            f'counts for {reviews} review(s).'))
+
+    def check_aggregates(self):
+        stale = list(find_stale_ratings().values_list(
+            'pk', 'score_sum', 'reviews_count',
+            'actual_sum', 'actual_count'))
+        for pk, score_sum, count, actual_sum, actual_count in stale:
+            self.stdout.write(
+                f'Title {pk}: stored {score_sum}/{count}, '
+                f'actual {actual_sum}/{actual_count}')
+        stale_reviews = list(find_stale_comment_counts().values_list(
+            'pk', 'comments_count', 'actual_count'))
+        for pk, count, actual_count in stale_reviews:
+            self.stdout.write(
+                f'Review {pk}: stored {count} comment(s), '
+                f'actual {actual_count}')
+        if stale or stale_reviews:
+            raise CommandError(
+                f'{len(stale)} stale title rating(s), '
+                f'{len(stale_reviews)} stale review comment count(s).')
+        self.stdout.write(
+            self.style.SUCCESS('All ratings are up to date.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import RATING_BATCH_SIZE, update_weighted_ratings
+
+
+class Command(BaseCommand):
+    help = ('Refresh the global rating priors and recompute the Bayesian '
+            'weighted rating of every title.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=RATING_BATCH_SIZE,
+            help='Number of titles updated per statement.')
+        parser.add_argument(
+            '--prior-weight', type=float,
+            help='Number of virtual mean-score reviews added to every '
+                 'title (defaults to RATING_PRIOR_WEIGHT).')
+
+    def handle(self, *args, **options):
+        updated, prior = update_weighted_ratings(
+            batch_size=options['batch_size'], weight=options['prior_weight'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Recalculated weighted ratings for {updated} title(s) '
+            f'(prior mean {prior.mean:.3f}, weight {prior.weight:g}).'))
@@ -0,0 +1,39 @@
+# Generated by Django 3.2 on 2026-10-18 01:29
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    aggregates = (Review.objects.order_by().values('title_id')
+                  .annotate(total=Sum('score'), count=Count('id')))
+    for row in aggregates.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            score_sum=row['total'],
+            reviews_count=row['count'],
+            rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_auto_20230927_0752'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_rating_aggregates,
+                             migrations.RunPython.noop),
+    ]
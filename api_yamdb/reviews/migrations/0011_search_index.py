@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from reviews.search import SQLiteFTS5Backend
+
+
+def install_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        SQLiteFTS5Backend().install(schema_editor)
+
+
+def uninstall_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        SQLiteFTS5Backend().uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2 on 2026-10-18 01:51
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_histogram(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    buckets = (Review.objects.filter(score__range=(1, 10)).order_by()
+               .values('title_id', 'score')
+               .annotate(count=Count('id')))
+    for row in buckets.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            **{f'score_{row["score"]}_count': row['count']})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_10_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_6_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_7_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_8_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_9_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_score_histogram,
+                             migrations.RunPython.noop),
+    ]
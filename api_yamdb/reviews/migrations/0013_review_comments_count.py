@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 01:54
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comments_count(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    counts = (Comment.objects.order_by().values('review_id')
+              .annotate(count=Count('id')))
+    for row in counts.iterator():
+        Review.objects.filter(pk=row['review_id']).update(
+            comments_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_comments_count,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 3.2 on 2026-10-18 01:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+
+
+def fill_weighted_rating(apps, schema_editor):
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    Title = apps.get_model('reviews', 'Title')
+    totals = Title.objects.aggregate(score_sum=Sum('score_sum'),
+                                     reviews_count=Sum('reviews_count'))
+    if totals['reviews_count']:
+        mean = totals['score_sum'] / totals['reviews_count']
+    else:
+        mean = settings.RATING_PRIOR_MEAN
+    weight = settings.RATING_PRIOR_WEIGHT
+    RatingPrior.objects.create(pk=1, mean=mean, weight=weight)
+    Title.objects.filter(reviews_count__gt=0).update(weighted_rating=(
+        (weight * mean + Cast('score_sum', FloatField()))
+        / (weight + F('reviews_count'))))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_ranking_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField()),
+                ('weight', models.FloatField()),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'reviews_count'], name='title_weighted_rating_idx'),
+        ),
+        migrations.RunPython(fill_weighted_rating,
+                             migrations.RunPython.noop),
+    ]
@@ -6,11 +6,24 @@ from api_yamdb.settings import LEN_MAX, LEN_NAME_SLUG
 
 User = get_user_model()
 
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_field(score):
+    return f'score_{score}_count'
+
 
 class Category(models.Model):
     name = models.CharField(max_length=LEN_MAX)
     slug = models.SlugField(max_length=LEN_NAME_SLUG, unique=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='category_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -19,6 +32,11 @@ class Genre(models.Model):
     name = models.CharField(max_length=LEN_MAX)
     slug = models.SlugField(max_length=LEN_NAME_SLUG, unique=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='genre_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -29,23 +47,65 @@ class Title(models.Model):
     description = models.TextField()
     genre = models.ManyToManyField(Genre, related_name='titles')
     category = models.ForeignKey(
-        Category, on_delete=models.SET_NULL, null=True, related_name='titles')
+        Category, on_delete=models.SET_NULL, null=True, related_name='titles',
+        db_index=False)
 
     rating = models.FloatField(null=True, blank=True)
+    weighted_rating = models.FloatField(null=True, blank=True)
+    score_sum = models.PositiveIntegerField(default=0)
+    reviews_count = models.PositiveIntegerField(default=0)
+    score_1_count = models.PositiveIntegerField(default=0)
+    score_2_count = models.PositiveIntegerField(default=0)
+    score_3_count = models.PositiveIntegerField(default=0)
+    score_4_count = models.PositiveIntegerField(default=0)
+    score_5_count = models.PositiveIntegerField(default=0)
+    score_6_count = models.PositiveIntegerField(default=0)
+    score_7_count = models.PositiveIntegerField(default=0)
+    score_8_count = models.PositiveIntegerField(default=0)
+    score_9_count = models.PositiveIntegerField(default=0)
+    score_10_count = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+            models.Index(fields=['category', 'name'],
+                         name='title_category_name_idx'),
+            models.Index(fields=['rating', 'reviews_count'],
+                         name='title_rating_idx'),
+            models.Index(fields=['reviews_count', 'rating'],
+                         name='title_popularity_idx'),
+            models.Index(fields=['category', 'rating'],
+                         name='title_category_rating_idx'),
+            models.Index(fields=['year', 'rating'],
+                         name='title_year_rating_idx'),
+            models.Index(fields=['weighted_rating', 'reviews_count'],
+                         name='title_weighted_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def histogram(self):
+        return {score: getattr(self, score_field(score))
+                for score in SCORES}
+
 
 class Review(models.Model):
     text = models.TextField()
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='reviews')
     score = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(1), MaxValueValidator(10)])
+        validators=[MinValueValidator(MIN_SCORE),
+                    MaxValueValidator(MAX_SCORE)])
     pub_date = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+    comments_count = models.PositiveIntegerField(default=0)
     title = models.ForeignKey(
-        Title, on_delete=models.CASCADE, related_name='reviews')
+        Title, on_delete=models.CASCADE, related_name='reviews',
+        db_index=False)
 
     class Meta:
         constraints = [
@@ -54,6 +114,9 @@ class Review(models.Model):
                 name='unique_title_author'
             )
         ]
+        indexes = [
+            models.Index(fields=['title', 'id'], name='review_title_id_idx'),
+        ]
 
 
 class Comment(models.Model):
@@ -61,5 +124,19 @@ class Comment(models.Model):
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='comments')
     pub_date = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
     review = models.ForeignKey(
-        Review, on_delete=models.CASCADE, related_name='comments')
+        Review, on_delete=models.CASCADE, related_name='comments',
+        db_index=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['review', 'id'],
+                         name='comment_review_id_idx'),
+        ]
+
+
+class RatingPrior(models.Model):
+    mean = models.FloatField()
+    weight = models.FloatField()
+    updated = models.DateTimeField(auto_now=True)
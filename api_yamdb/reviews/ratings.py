@@ -0,0 +1,238 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              IntegerField, OuterRef, Q, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .models import (SCORES, Comment, RatingPrior, Review, Title,
+                     score_field)
+
+RATING_BATCH_SIZE = 1000
+PRIOR_ID = 1
+
+
+def _average(score_sum, reviews_count):
+    return ExpressionWrapper(
+        Cast(score_sum, FloatField()) / reviews_count,
+        output_field=FloatField())
+
+
+def _weighted_average(score_sum, reviews_count, mean, weight):
+    # Bayesian average: the title's scores plus `weight` virtual reviews
+    # scoring the catalogue-wide mean.
+    return ExpressionWrapper(
+        (weight * mean + Cast(score_sum, FloatField()))
+        / (weight + reviews_count),
+        output_field=FloatField())
+
+
+def _stored_prior(field, default):
+    prior = RatingPrior.objects.filter(pk=PRIOR_ID).values(field)[:1]
+    return Coalesce(Subquery(prior, output_field=FloatField()),
+                    Value(default, output_field=FloatField()))
+
+
+def _shift_aggregates(title_id, score_delta, count_delta, buckets):
+    # The right-hand side of an UPDATE sees the old row, so the new rating
+    # is computed from the shifted values within the same statement.
+    score_sum = F('score_sum') + score_delta
+    reviews_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        **{score_field(score): F(score_field(score)) + delta
+           for score, delta in buckets.items()},
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=Case(
+            When(reviews_count__lte=-count_delta, then=Value(None)),
+            default=_average(score_sum, reviews_count),
+            output_field=FloatField(),
+        ),
+        weighted_rating=Case(
+            When(reviews_count__lte=-count_delta, then=Value(None)),
+            default=_weighted_average(
+                score_sum, reviews_count,
+                _stored_prior('mean', settings.RATING_PRIOR_MEAN),
+                _stored_prior('weight', settings.RATING_PRIOR_WEIGHT)),
+            output_field=FloatField(),
+        ),
+        modified=timezone.now(),
+    )
+
+
+def review_created(review):
+    _shift_aggregates(review.title_id, review.score, 1, {review.score: 1})
+
+
+def review_updated(review, old_score):
+    if review.score != old_score:
+        _shift_aggregates(review.title_id, review.score - old_score, 0,
+                          {review.score: 1, old_score: -1})
+
+
+def review_deleted(review):
+    _shift_aggregates(review.title_id, -review.score, -1,
+                      {review.score: -1})
+
+
+def reviews_deleted(reviews):
+    # One UPDATE per title instead of one per review.
+    shifts = defaultdict(lambda: [0, 0, {}])
+    rows = (reviews.order_by().values('title_id', 'score')
+            .annotate(count=Count('id')))
+    for row in rows:
+        shift = shifts[row['title_id']]
+        shift[0] -= row['score'] * row['count']
+        shift[1] -= row['count']
+        shift[2][row['score']] = -row['count']
+    for title_id, (score_delta, count_delta, buckets) in shifts.items():
+        _shift_aggregates(title_id, score_delta, count_delta, buckets)
+    return bool(shifts)
+
+
+def _shift_comments_count(review_id, delta):
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta,
+        modified=timezone.now(),
+    )
+
+
+def comment_created(comment):
+    _shift_comments_count(comment.review_id, 1)
+
+
+def comment_deleted(comment):
+    _shift_comments_count(comment.review_id, -1)
+
+
+def comments_deleted(comments):
+    rows = (comments.order_by().values('review_id')
+            .annotate(count=Count('id')))
+    for row in rows:
+        _shift_comments_count(row['review_id'], -row['count'])
+
+
+def _review_aggregate(aggregate):
+    reviews = (Review.objects.filter(title=OuterRef('pk')).order_by()
+               .values('title').annotate(value=aggregate).values('value'))
+    return Coalesce(Subquery(reviews, output_field=IntegerField()), 0)
+
+
+def _histogram_aggregates():
+    return {score_field(score): _review_aggregate(
+        Count('id', filter=Q(score=score))) for score in SCORES}
+
+
+def recalculate_ratings(batch_size=RATING_BATCH_SIZE):
+    ids = Title.objects.order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    updated = 0
+    while True:
+        chunk = list(ids.filter(pk__gt=last_id)[:batch_size])
+        if not chunk:
+            return updated
+        with transaction.atomic():
+            titles = Title.objects.filter(pk__in=chunk)
+            titles.update(score_sum=_review_aggregate(Sum('score')),
+                          reviews_count=_review_aggregate(Count('id')),
+                          modified=timezone.now(),
+                          **_histogram_aggregates())
+            titles.update(rating=Case(
+                When(reviews_count=0, then=Value(None)),
+                default=_average(F('score_sum'), F('reviews_count')),
+                output_field=FloatField(),
+            ))
+        updated += len(chunk)
+        last_id = chunk[-1]
+
+
+def _comments_count():
+    comments = (Comment.objects.filter(review=OuterRef('pk')).order_by()
+                .values('review').annotate(value=Count('id')).values('value'))
+    return Coalesce(Subquery(comments, output_field=IntegerField()), 0)
+
+
+def recalculate_comment_counts(batch_size=RATING_BATCH_SIZE):
+    ids = Review.objects.order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    updated = 0
+    while True:
+        chunk = list(ids.filter(pk__gt=last_id)[:batch_size])
+        if not chunk:
+            return updated
+        Review.objects.filter(pk__in=chunk).update(
+            comments_count=_comments_count(), modified=timezone.now())
+        updated += len(chunk)
+        last_id = chunk[-1]
+
+
+def find_stale_comment_counts():
+    return (Review.objects.annotate(actual_count=_comments_count())
+            .exclude(comments_count=F('actual_count')).order_by('pk'))
+
+
+def refresh_priors(weight=None):
+    totals = Title.objects.aggregate(score_sum=Sum('score_sum'),
+                                     reviews_count=Sum('reviews_count'))
+    if totals['reviews_count']:
+        mean = totals['score_sum'] / totals['reviews_count']
+    else:
+        mean = settings.RATING_PRIOR_MEAN
+    if weight is None:
+        weight = settings.RATING_PRIOR_WEIGHT
+    prior, _ = RatingPrior.objects.update_or_create(
+        pk=PRIOR_ID, defaults={'mean': mean, 'weight': weight})
+    return prior
+
+
+def update_weighted_ratings(batch_size=RATING_BATCH_SIZE, weight=None):
+    prior = refresh_priors(weight)
+    weighted = Case(
+        When(reviews_count=0, then=Value(None)),
+        default=_weighted_average(
+            F('score_sum'), F('reviews_count'),
+            Value(prior.mean, output_field=FloatField()),
+            Value(prior.weight, output_field=FloatField())),
+        output_field=FloatField(),
+    )
+    ids = Title.objects.order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    updated = 0
+    while True:
+        chunk = list(ids.filter(pk__gt=last_id)[:batch_size])
+        if not chunk:
+            return updated, prior
+        Title.objects.filter(pk__in=chunk).update(
+            weighted_rating=weighted, modified=timezone.now())
+        updated += len(chunk)
+        last_id = chunk[-1]
+
+
+def find_stale_ratings():
+    histogram = {f'actual_{name}': aggregate
+                 for name, aggregate in _histogram_aggregates().items()}
+    return (Title.objects
+            .annotate(actual_sum=_review_aggregate(Sum('score')),
+                      actual_count=_review_aggregate(Count('id')),
+                      **histogram)
+            .exclude(score_sum=F('actual_sum'),
+                     reviews_count=F('actual_count'),
+                     **{name[len('actual_'):]: F(name) for name in histogram})
+            .order_by('pk'))
+
+
+def get_median(histogram):
+    count = sum(histogram.values())
+    if not count:
+        return None
+    middle = ((count - 1) // 2, count // 2)
+    values = []
+    seen = 0
+    for score, bucket in sorted(histogram.items()):
+        values.extend(score for position in middle
+                      if seen <= position < seen + bucket)
+        seen += bucket
+    return sum(values) / len(values)
@@ -0,0 +1,268 @@
+import re
+from collections import namedtuple
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Comment, Review, Title
+
+SearchIndex = namedtuple('SearchIndex', 'model fields weights parents')
+
+SEARCH_INDEXES = {
+    'title': SearchIndex(Title, ('name', 'description'), (10.0, 1.0), {}),
+    'review': SearchIndex(Review, ('text',), (1.0,), {'title_id': 'title_id'}),
+    'comment': SearchIndex(Comment, ('text',), (1.0,), {
+        'title_id': 'review__title_id', 'review_id': 'review_id'}),
+}
+
+TERM_RE = re.compile(r'\w+\*?')
+TRIGGER_ACTIONS = ('insert', 'delete', 'update')
+SNIPPET_WORDS = 12
+
+
+def parse_terms(query):
+    return [(term.rstrip('*'), term.endswith('*'))
+            for term in TERM_RE.findall(query)]
+
+
+def get_index(model):
+    for kind, index in SEARCH_INDEXES.items():
+        if index.model is model:
+            return kind, index
+    return None, None
+
+
+class SearchResults:
+
+    def __init__(self, backend, terms, kinds):
+        self.backend = backend
+        self.terms = terms
+        self.kinds = kinds
+
+    def count(self):
+        if not self.terms:
+            return 0
+        return self.backend.count_hits(self.terms, self.kinds)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not self.terms:
+            return []
+        hits = self.backend.fetch_hits(
+            self.terms, self.kinds, page.start or 0, page.stop - page.start)
+        return self.attach_parents(hits)
+
+    @staticmethod
+    def attach_parents(hits):
+        for kind, index in SEARCH_INDEXES.items():
+            ids = [hit['id'] for hit in hits if hit['type'] == kind]
+            if not ids or not index.parents:
+                continue
+            lookups = list(index.parents.values())
+            parents = {
+                row[0]: dict(zip(index.parents, row[1:]))
+                for row in index.model.objects.filter(pk__in=ids)
+                .values_list('pk', *lookups)
+            }
+            for hit in hits:
+                if hit['type'] == kind:
+                    hit.update(parents.get(hit['id'], {}))
+        return hits
+
+
+class BaseSearchBackend:
+
+    def search(self, query, kinds=None):
+        return SearchResults(self, parse_terms(query),
+                             list(kinds or SEARCH_INDEXES))
+
+
+class LikeSearchBackend(BaseSearchBackend):
+
+    @staticmethod
+    def term_filter(index, terms):
+        return reduce(and_, (
+            reduce(or_, (Q(**{f'{field}__icontains': word})
+                         for field in index.fields))
+            for word, _ in terms))
+
+    def filter_queryset(self, queryset, query):
+        _, index = get_index(queryset.model)
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        return queryset.filter(self.term_filter(index, terms))
+
+    def count_hits(self, terms, kinds):
+        return sum(
+            SEARCH_INDEXES[kind].model.objects.filter(
+                self.term_filter(SEARCH_INDEXES[kind], terms)).count()
+            for kind in kinds)
+
+    def fetch_hits(self, terms, kinds, offset, limit):
+        hits = []
+        for kind in kinds:
+            index = SEARCH_INDEXES[kind]
+            rows = (index.model.objects
+                    .filter(self.term_filter(index, terms))
+                    .order_by('pk').values_list('pk', index.fields[0])
+                    [:offset + limit])
+            hits.extend({'type': kind, 'id': pk, 'score': None,
+                         'snippet': ' '.join(text.split()[:SNIPPET_WORDS])}
+                        for pk, text in rows)
+        return hits[offset:offset + limit]
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    @staticmethod
+    def fts_table(index):
+        return f'{index.model._meta.db_table}_fts'
+
+    @staticmethod
+    def to_match(terms):
+        return ' '.join(f'"{word}"' + ('*' if prefix else '')
+                        for word, prefix in terms)
+
+    def rank(self, index):
+        weights = ', '.join(str(weight) for weight in index.weights)
+        return f'bm25("{self.fts_table(index)}", {weights})'
+
+    def filter_queryset(self, queryset, query):
+        _, index = get_index(queryset.model)
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        fts = self.fts_table(index)
+        table = index.model._meta.db_table
+        return queryset.extra(
+            select={'search_rank': self.rank(index)},
+            tables=[fts],
+            where=[f'"{fts}".rowid = "{table}"."id"', f'"{fts}" MATCH %s'],
+            params=[self.to_match(terms)],
+        ).order_by('search_rank', 'pk')
+
+    def count_hits(self, terms, kinds):
+        counts = ' + '.join(
+            f'(SELECT COUNT(*) FROM "{self.fts_table(SEARCH_INDEXES[kind])}"'
+            f' WHERE "{self.fts_table(SEARCH_INDEXES[kind])}" MATCH %s)'
+            for kind in kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {counts}',
+                           [self.to_match(terms)] * len(kinds))
+            return cursor.fetchone()[0]
+
+    def hits_select(self, kind):
+        index = SEARCH_INDEXES[kind]
+        fts = self.fts_table(index)
+        return (
+            f"SELECT '{kind}', rowid, -{self.rank(index)}, "
+            f"snippet(\"{fts}\", -1, '', '', '...', {SNIPPET_WORDS}) "
+            f'FROM "{fts}" WHERE "{fts}" MATCH %s'
+        )
+
+    def fetch_hits(self, terms, kinds, offset, limit):
+        selects = ' UNION ALL '.join(self.hits_select(kind) for kind in kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{selects} ORDER BY 3 DESC, 1, 2 LIMIT %s OFFSET %s',
+                [self.to_match(terms)] * len(kinds) + [limit, offset])
+            return [
+                {'type': kind, 'id': pk, 'score': score, 'snippet': snippet}
+                for kind, pk, score, snippet in cursor.fetchall()
+            ]
+
+    def install(self, schema_editor):
+        for index in SEARCH_INDEXES.values():
+            fts = self.fts_table(index)
+            columns = ', '.join(f'"{field}"' for field in index.fields)
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE "{fts}" USING fts5({columns}, '
+                f"content='{index.model._meta.db_table}', "
+                f"content_rowid='id', tokenize='{self.tokenizer}')")
+            self.install_triggers(schema_editor, index)
+
+    def uninstall(self, schema_editor):
+        for index in SEARCH_INDEXES.values():
+            fts = self.fts_table(index)
+            for action in TRIGGER_ACTIONS:
+                schema_editor.execute(
+                    f'DROP TRIGGER IF EXISTS "{fts}_{action}"')
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{fts}"')
+
+    def install_triggers(self, schema_editor, index):
+        fts = self.fts_table(index)
+        table = index.model._meta.db_table
+        columns = ', '.join(f'"{field}"' for field in index.fields)
+        new = ', '.join(f'new."{field}"' for field in index.fields)
+        old = ', '.join(f'old."{field}"' for field in index.fields)
+        delete = (f'INSERT INTO "{fts}"("{fts}", rowid, {columns}) '
+                  f"VALUES ('delete', old.id, {old});")
+        insert = (f'INSERT INTO "{fts}"(rowid, {columns}) '
+                  f'VALUES (new.id, {new});')
+        triggers = {
+            'insert': f'AFTER INSERT ON "{table}" BEGIN {insert} END',
+            'delete': f'AFTER DELETE ON "{table}" BEGIN {delete} END',
+            'update': (f'AFTER UPDATE OF {columns} ON "{table}" '
+                       f'BEGIN {delete} {insert} END'),
+        }
+        for action in TRIGGER_ACTIONS:
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS "{fts}_{action}"')
+            schema_editor.execute(
+                f'CREATE TRIGGER "{fts}_{action}" {triggers[action]}')
+        schema_editor.execute(
+            f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')')
+
+    def prepare_connection(self, connection):
+        # FTS5 reads its config when a connection first touches the table.
+        # Inside a write that read opens a snapshot before the write lock,
+        # and a concurrent commit then fails the write with "database is
+        # locked" instead of waiting out busy_timeout.
+        tables = ' UNION ALL '.join(
+            f'SELECT rowid FROM "{self.fts_table(index)}"'
+            for index in SEARCH_INDEXES.values())
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'{tables} LIMIT 0')
+        except DatabaseError:
+            # The index is created by migrations that have not run yet.
+            pass
+
+    def repair(self, schema_editor):
+        # SQLite rebuilds a table for most ALTER operations and the old
+        # table's triggers go with it, so put them back after migrations.
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master "
+                           "WHERE type IN ('table', 'trigger')")
+            existing = {name for name, in cursor.fetchall()}
+        for index in SEARCH_INDEXES.values():
+            fts = self.fts_table(index)
+            triggers = {f'{fts}_{action}' for action in TRIGGER_ACTIONS}
+            if fts in existing and not triggers <= existing:
+                self.install_triggers(schema_editor, index)
+
+
+def repair_search_index(using, **kwargs):
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        with connection.schema_editor() as schema_editor:
+            SQLiteFTS5Backend().repair(schema_editor)
+
+
+def prepare_search_connection(sender, connection, **kwargs):
+    # Replicas only serve reads, so they never hit the write race.
+    if (connection.vendor == 'sqlite'
+            and connection.alias not in settings.DATABASE_REPLICAS):
+        SQLiteFTS5Backend().prepare_connection(connection)
+
+
+def get_backend():
+    return import_string(settings.SEARCH_BACKEND)()
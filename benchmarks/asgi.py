@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import io
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .runner import (benchmark_database, percentile, quiet_slow_log,
+                     setup_django, write_report)
+
+DEFAULT_DURATION = 3.0
+DEFAULT_CONCURRENCY = (10, 100, 1000)
+SERVERS = ('wsgi', 'asgi-django', 'asgi')
+HOST = 'testserver'
+
+
+async def call_asgi(app, method, path, headers=(), body=b''):
+    path, _, query = path.partition('?')
+    if body:
+        headers = [*headers, ('content-length', str(len(body)))]
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())] + [
+            (name.lower().encode(), value.encode())
+            for name, value in headers],
+        'server': (HOST, 80),
+        'client': ('127.0.0.1', 0),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    response = {'status': None, 'headers': [], 'body': []}
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = message['headers']
+        else:
+            response['body'].append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return response['status'], response['headers'], b''.join(
+        response['body'])
+
+
+def call_wsgi(app, method, path, headers=(), body=b''):
+    path, _, query = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': HOST,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers:
+        key = name.upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        environ[key] = value
+    started = []
+
+    def start_response(status, response_headers, exc_info=None):
+        started[:] = [int(status.split()[0]), response_headers]
+
+    result = app(environ, start_response)
+    try:
+        content = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return started[0], started[1], content
+
+
+def get_paths():
+    from reviews.models import Comment, Title
+
+    titles = list(Title.objects.order_by('pk').values_list('pk', flat=True))
+    comment = Comment.objects.values('review_id', 'review__title_id').first()
+    paths = ['/api/v1/categories/', '/api/v1/genres/']
+    paths += [f'/api/v1/titles/?page={page}' for page in (1, 2, 3)]
+    paths += [f'/api/v1/titles/{pk}/' for pk in titles[:20]]
+    paths += [f'/api/v1/titles/{pk}/reviews/' for pk in titles[:20]]
+    if comment:
+        paths.append(f'/api/v1/titles/{comment["review__title_id"]}/'
+                     f'reviews/{comment["review_id"]}/comments/')
+    return paths
+
+
+def get_servers(threads):
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+
+    from api.asgi import get_asgi_application as get_pooled_application
+
+    wsgi = get_wsgi_application()
+    pool = ThreadPoolExecutor(max_workers=threads,
+                              thread_name_prefix='wsgi-worker')
+
+    def wsgi_request(path):
+        return asyncio.get_running_loop().run_in_executor(
+            pool, call_wsgi, wsgi, 'GET', path)
+
+    def asgi_request(app):
+        return lambda path: call_asgi(app, 'GET', path)
+
+    return {
+        'wsgi': wsgi_request,
+        'asgi-django': asgi_request(get_asgi_application()),
+        'asgi': asgi_request(get_pooled_application()),
+    }
+
+
+async def client(request, paths, rng, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        status, _, _ = await request(rng.choice(paths))
+        if status >= 500:
+            errors[status] += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+
+
+async def run_level(request, paths, concurrency, duration, seed):
+    latencies, errors = [], Counter()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(request, paths, random.Random(seed + idx), deadline,
+               latencies, errors)
+        for idx in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    summary = {'requests': len(latencies),
+               'errors': {str(status): count
+                          for status, count in sorted(errors.items())}}
+    if latencies:
+        summary.update({
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        })
+    return summary
+
+
+def run(scale, servers=SERVERS, concurrency=DEFAULT_CONCURRENCY,
+        duration=DEFAULT_DURATION, seed=0):
+    from django.conf import settings
+
+    from .datasets import generate
+
+    generate(scale, seed=seed)
+    paths = get_paths()
+    requests = get_servers(settings.ASGI_THREADS)
+    report = {}
+    for server in servers:
+        report[server] = {
+            str(level): asyncio.run(run_level(
+                requests[server], paths, level, duration, seed))
+            for level in concurrency
+        }
+    return report
+
+
+def parse_args(argv):
+    from .datasets import SCALES
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.asgi',
+        description='Compare throughput and tail latency of the public read '
+                    'endpoints served through WSGI, the stock Django ASGI '
+                    'handler and the thread pool ASGI handler, driven '
+                    'in-process by concurrent clients.')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help='Seconds to run each concurrency level.')
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument('--servers', nargs='+', choices=SERVERS,
+                        default=list(SERVERS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    setup_django()
+    from django.conf import settings
+
+    from .datasets import SCALES
+
+    args = parse_args(argv)
+    quiet_slow_log()
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    with benchmark_database():
+        report = {
+            'meta': {'scale': SCALES[args.scale]._asdict(),
+                     'duration': args.duration,
+                     'threads': settings.ASGI_THREADS, 'seed': args.seed},
+            'servers': run(SCALES[args.scale], args.servers,
+                           args.concurrency, args.duration, args.seed),
+        }
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment, Genre,
+                            Review, Title)
+from reviews.ratings import (recalculate_comment_counts, recalculate_ratings,
+                             update_weighted_ratings)
+
+User = get_user_model()
+
+Scale = namedtuple('Scale', 'users titles reviews comments')
+
+SCALES = {
+    'small': Scale(users=100, titles=200, reviews=1_000, comments=1_000),
+    'medium': Scale(users=1_000, titles=5_000, reviews=100_000,
+                    comments=100_000),
+    'large': Scale(users=5_000, titles=20_000, reviews=1_000_000,
+                   comments=500_000),
+}
+
+BATCH_SIZE = 5000
+CATEGORIES = ('Фильм', 'Книга', 'Музыка', 'Сериал', 'Игра')
+GENRES = ('Драма', 'Комедия', 'Фантастика', 'Детектив', 'Вестерн',
+          'Триллер', 'Мелодрама', 'Документальный', 'Ужасы', 'Мюзикл')
+WORDS = ('пустыня', 'планета', 'сюжет', 'герой', 'финал', 'музыка',
+         'актёр', 'роман', 'история', 'город', 'дорога', 'океан',
+         'война', 'любовь', 'тайна', 'море', 'время', 'память')
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def insert(model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def ids(model):
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def generate(scale, seed=0):
+    if scale.reviews > scale.users * scale.titles:
+        raise ValueError('Each user can review a title only once.')
+    rng = random.Random(seed)
+    password = make_password(None)
+    with transaction.atomic():
+        insert(Category, (Category(name=name, slug=f'category-{idx}')
+                          for idx, name in enumerate(CATEGORIES)))
+        insert(Genre, (Genre(name=name, slug=f'genre-{idx}')
+                       for idx, name in enumerate(GENRES)))
+        insert(User, (
+            User(username=f'user_{idx}', email=f'user_{idx}@yamdb.fake',
+                 password=password, confirmation_code='benchmark')
+            for idx in range(scale.users)))
+        categories, genres, users = ids(Category), ids(Genre), ids(User)
+        insert(Title, (
+            Title(name=f'{text(rng, 2).capitalize()} {idx}',
+                  year=rng.randint(1950, 2023),
+                  description=text(rng, 12),
+                  category_id=rng.choice(categories))
+            for idx in range(scale.titles)))
+        titles = ids(Title)
+        insert(Title.genre.through, (
+            Title.genre.through(title_id=title_id, genre_id=genre_id)
+            for title_id in titles
+            for genre_id in rng.sample(genres, rng.randint(1, 3))))
+        # Walking titles in the inner loop keeps (title, author) unique.
+        insert(Review, (
+            Review(title_id=titles[idx % len(titles)],
+                   author_id=users[idx // len(titles)],
+                   text=text(rng, 20),
+                   score=rng.randint(MIN_SCORE, MAX_SCORE))
+            for idx in range(scale.reviews)))
+        reviews = ids(Review)
+        insert(Comment, (
+            Comment(review_id=rng.choice(reviews),
+                    author_id=rng.choice(users),
+                    text=text(rng, 10))
+            for _ in range(scale.comments)))
+    recalculate_ratings(batch_size=BATCH_SIZE)
+    update_weighted_ratings(batch_size=BATCH_SIZE)
+    recalculate_comment_counts(batch_size=BATCH_SIZE)
+    return describe()
+
+
+def describe():
+    return {
+        model._meta.model_name: model.objects.count()
+        for model in (User, Category, Genre, Title, Review, Comment)
+    }
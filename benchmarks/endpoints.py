@@ -0,0 +1,204 @@
+import random
+from collections import defaultdict, namedtuple
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from api.views import TokenView
+from reviews.models import Comment
+
+User = get_user_model()
+
+Scenario = namedtuple(
+    'Scenario', 'name client method path data remember max_iterations',
+    defaults=(None, None, None))
+Sample = namedtuple('Sample', 'title review comment')
+
+SAMPLES = 100
+BULK_SIZE = 10
+
+
+class Context:
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        self.admin = User.objects.create_user(
+            username='bench_admin', email='bench_admin@yamdb.fake',
+            role=User.Roles.ADMIN)
+        self.user = User.objects.create_user(
+            username='bench_user', email='bench_user@yamdb.fake')
+        self.clients = {
+            'anon': APIClient(),
+            'user': self.client_for(self.user),
+            'admin': self.client_for(self.admin),
+        }
+        comments = list(Comment.objects.order_by('pk')
+                        .values_list('pk', flat=True))
+        picked = rng.sample(comments, min(SAMPLES, len(comments)))
+        self.samples = [
+            Sample(*row) for row in Comment.objects.filter(pk__in=picked)
+            .order_by('pk').values_list('review__title_id', 'review_id', 'pk')
+        ]
+        self.created = defaultdict(dict)
+
+    @staticmethod
+    def client_for(user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {TokenView.get_token(user)["access"]}')
+        return client
+
+    def sample(self, idx):
+        return self.samples[idx % len(self.samples)]
+
+    def remember(self, key, idx, data):
+        if isinstance(data, list):
+            self.created[key][idx] = [item.get('id') or item.get('slug')
+                                      for item in data]
+        else:
+            self.created[key][idx] = data.get('id')
+
+    def get(self, key, idx):
+        return self.created[key].get(idx)
+
+
+def title_url(ctx, idx):
+    return f'/api/v1/titles/{ctx.sample(idx).title}/'
+
+
+def reviews_url(ctx, idx):
+    return f'{title_url(ctx, idx)}reviews/'
+
+
+def comments_url(ctx, idx):
+    return f'{reviews_url(ctx, idx)}{ctx.sample(idx).review}/comments/'
+
+
+def new_titles(ctx, idx):
+    return [{'name': f'Бенчмарк {idx}-{num}', 'year': 2000,
+             'description': 'Пакетная загрузка', 'genre': ['genre-0'],
+             'category': 'category-0'} for num in range(BULK_SIZE)]
+
+
+def slugs(prefix, idx):
+    return [{'name': f'Бенчмарк {idx}-{num}', 'slug': f'{prefix}-{idx}-{num}'}
+            for num in range(BULK_SIZE)]
+
+
+def read_scenarios():
+    return [
+        Scenario('api-root', 'anon', 'get', '/api/v1/'),
+        Scenario('categories-list', 'anon', 'get', '/api/v1/categories/'),
+        Scenario('genres-list', 'anon', 'get', '/api/v1/genres/'),
+        Scenario('titles-list', 'anon', 'get', '/api/v1/titles/'),
+        Scenario('titles-list-uncached', 'user', 'get', '/api/v1/titles/'),
+        Scenario('titles-list-filtered', 'user', 'get',
+                 '/api/v1/titles/?genre=genre-1&ordering=-rating'),
+        Scenario('titles-search', 'user', 'get',
+                 '/api/v1/titles/?search=пустыня'),
+        Scenario('titles-detail', 'anon', 'get', title_url),
+        Scenario('titles-stats', 'anon', 'get',
+                 lambda ctx, idx: f'{title_url(ctx, idx)}stats/'),
+        Scenario('titles-top', 'anon', 'get', '/api/v1/titles/top/'),
+        Scenario('titles-top-weighted', 'user', 'get',
+                 '/api/v1/titles/top/?by=weighted&limit=50'),
+        Scenario('reviews-list', 'anon', 'get', reviews_url),
+        Scenario('reviews-detail', 'anon', 'get',
+                 lambda ctx, idx: f'{reviews_url(ctx, idx)}'
+                                  f'{ctx.sample(idx).review}/'),
+        Scenario('comments-list', 'anon', 'get', comments_url),
+        Scenario('comments-detail', 'anon', 'get',
+                 lambda ctx, idx: f'{comments_url(ctx, idx)}'
+                                  f'{ctx.sample(idx).comment}/'),
+        Scenario('search', 'anon', 'get', '/api/v1/search/?q=пустыня'),
+        Scenario('users-list', 'admin', 'get', '/api/v1/users/'),
+        Scenario('users-detail', 'admin', 'get',
+                 '/api/v1/users/bench_user/'),
+        Scenario('users-me', 'user', 'get', '/api/v1/users/me/'),
+        Scenario('cache-stats', 'admin', 'get', '/api/v1/cache/stats/'),
+        Scenario('metrics', 'admin', 'get', '/api/v1/metrics/'),
+        Scenario('export-titles', 'admin', 'get', '/api/v1/export/titles/',
+                 max_iterations=3),
+    ]
+
+
+def write_scenarios():
+    return [
+        Scenario('auth-signup', 'anon', 'post', '/api/v1/auth/signup/',
+                 lambda ctx, idx: {'username': f'bench_signup_{idx}',
+                                   'email': f'bench_signup_{idx}@yamdb.fake'}),
+        Scenario('auth-token', 'anon', 'post', '/api/v1/auth/token/',
+                 lambda ctx, idx: {
+                     'username': ctx.user.username,
+                     'confirmation_code': ctx.user.confirmation_code}),
+        Scenario('users-me-update', 'user', 'patch', '/api/v1/users/me/',
+                 lambda ctx, idx: {'bio': f'Бенчмарк {idx}'}),
+        Scenario('users-create', 'admin', 'post', '/api/v1/users/',
+                 lambda ctx, idx: {'username': f'bench_new_{idx}',
+                                   'email': f'bench_new_{idx}@yamdb.fake'}),
+        Scenario('users-update', 'admin', 'patch',
+                 lambda ctx, idx: f'/api/v1/users/bench_new_{idx}/',
+                 {'role': 'moderator'}),
+        Scenario('users-delete', 'admin', 'delete',
+                 lambda ctx, idx: f'/api/v1/users/bench_new_{idx}/'),
+        Scenario('reviews-create', 'user', 'post', reviews_url,
+                 {'text': 'Бенчмарк', 'score': 7}, remember='review'),
+        Scenario('reviews-update', 'user', 'patch',
+                 lambda ctx, idx: f'{reviews_url(ctx, idx)}'
+                                  f'{ctx.get("review", idx)}/',
+                 {'score': 9}),
+        Scenario('comments-create', 'user', 'post', comments_url,
+                 {'text': 'Бенчмарк'}, remember='comment'),
+        Scenario('comments-delete', 'user', 'delete',
+                 lambda ctx, idx: f'{comments_url(ctx, idx)}'
+                                  f'{ctx.get("comment", idx)}/'),
+        Scenario('reviews-delete', 'user', 'delete',
+                 lambda ctx, idx: f'{reviews_url(ctx, idx)}'
+                                  f'{ctx.get("review", idx)}/'),
+        Scenario('titles-create', 'admin', 'post', '/api/v1/titles/',
+                 lambda ctx, idx: new_titles(ctx, idx)[0], remember='title'),
+        Scenario('titles-update', 'admin', 'patch',
+                 lambda ctx, idx: f'/api/v1/titles/{ctx.get("title", idx)}/',
+                 {'year': 2001}),
+        Scenario('titles-delete', 'admin', 'delete',
+                 lambda ctx, idx: f'/api/v1/titles/{ctx.get("title", idx)}/'),
+        Scenario('titles-bulk-create', 'admin', 'post',
+                 '/api/v1/titles/bulk/', new_titles, remember='titles'),
+        Scenario('titles-bulk-update', 'admin', 'patch',
+                 '/api/v1/titles/bulk/',
+                 lambda ctx, idx: [{'id': pk, 'year': 2001}
+                                   for pk in ctx.get('titles', idx)]),
+        Scenario('titles-bulk-delete', 'admin', 'delete',
+                 '/api/v1/titles/bulk/',
+                 lambda ctx, idx: ctx.get('titles', idx)),
+        Scenario('genres-create', 'admin', 'post', '/api/v1/genres/',
+                 lambda ctx, idx: slugs('bench-genre', idx)[0]),
+        Scenario('genres-delete', 'admin', 'delete',
+                 lambda ctx, idx: f'/api/v1/genres/bench-genre-{idx}-0/'),
+        Scenario('genres-bulk-create', 'admin', 'post',
+                 '/api/v1/genres/bulk/',
+                 lambda ctx, idx: slugs('bench-genres', idx)),
+        Scenario('genres-bulk-delete', 'admin', 'delete',
+                 '/api/v1/genres/bulk/',
+                 lambda ctx, idx: [item['slug']
+                                   for item in slugs('bench-genres', idx)]),
+        Scenario('categories-create', 'admin', 'post', '/api/v1/categories/',
+                 lambda ctx, idx: slugs('bench-category', idx)[0]),
+        Scenario('categories-delete', 'admin', 'delete',
+                 lambda ctx, idx: f'/api/v1/categories/'
+                                  f'bench-category-{idx}-0/'),
+        Scenario('categories-bulk-create', 'admin', 'post',
+                 '/api/v1/categories/bulk/',
+                 lambda ctx, idx: slugs('bench-categories', idx)),
+        Scenario('categories-bulk-update', 'admin', 'patch',
+                 '/api/v1/categories/bulk/',
+                 lambda ctx, idx: slugs('bench-categories', idx)),
+        Scenario('categories-bulk-delete', 'admin', 'delete',
+                 '/api/v1/categories/bulk/',
+                 lambda ctx, idx: [item['slug'] for item
+                                   in slugs('bench-categories', idx)]),
+    ]
+
+
+def get_scenarios():
+    return read_scenarios() + write_scenarios()
@@ -0,0 +1,123 @@
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+from .runner import benchmark_database, setup_django, write_report
+
+DEFAULT_ITERATIONS = 200
+DEFAULT_PAGE_SIZES = (10, 100, 1000)
+
+
+def get_pages(page_size):
+    from api.serializers import ReviewSerializer, TitleSerializer
+    from reviews.models import Review, Title
+
+    titles = (Title.objects.select_related('category')
+              .prefetch_related('genre').order_by('pk')[:page_size])
+    reviews = Review.objects.select_related('author').order_by('pk')[
+        :page_size]
+    return {
+        'titles': TitleSerializer(titles, many=True).data,
+        'reviews': ReviewSerializer(reviews, many=True).data,
+    }
+
+
+def as_page(results):
+    # The shape PageNumberPagination wraps the results in.
+    return {'count': len(results), 'next': 'http://testserver/api/v1/'
+            'titles/?page=2', 'previous': None, 'results': results}
+
+
+def timed(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def compare(baseline, fast, iterations):
+    baseline_time = timed(baseline, iterations)
+    fast_time = timed(fast, iterations)
+    return {
+        'stdlib_us': round(baseline_time * 1e6, 1),
+        'fast_us': round(fast_time * 1e6, 1),
+        'speedup': round(baseline_time / fast_time, 2),
+    }
+
+
+def measure(data, iterations):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer
+
+    renderers = JSONRenderer(), FastJSONRenderer()
+    content = renderers[0].render(data)
+    parsers = JSONParser(), FastJSONParser()
+    return {
+        'rows': len(data['results']),
+        'bytes': len(content),
+        'identical': renderers[1].render(data) == content,
+        'render': compare(*(
+            lambda renderer=renderer: renderer.render(data)
+            for renderer in renderers), iterations),
+        'parse': compare(*(
+            lambda parser=parser: parser.parse(io.BytesIO(content))
+            for parser in parsers), iterations),
+    }
+
+
+def run(scale, page_sizes=DEFAULT_PAGE_SIZES, iterations=DEFAULT_ITERATIONS,
+        seed=0):
+    from .datasets import generate
+
+    generate(scale, seed=seed)
+    report = {}
+    for page_size in page_sizes:
+        for name, results in get_pages(page_size).items():
+            report.setdefault(name, {})[str(page_size)] = measure(
+                as_page(results), iterations)
+    return report
+
+
+def parse_args(argv):
+    from .datasets import SCALES
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.json_rendering',
+        description='Compare rendering and parsing of title and review '
+                    'pages with the stdlib JSON renderer and parser and '
+                    'with the orjson based ones used by the API.')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--page-sizes', type=int, nargs='+',
+                        default=list(DEFAULT_PAGE_SIZES))
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    setup_django()
+    from api.renderers import orjson
+
+    from .datasets import SCALES
+
+    args = parse_args(argv)
+    with benchmark_database():
+        report = {
+            'meta': {'scale': SCALES[args.scale]._asdict(),
+                     'iterations': args.iterations, 'seed': args.seed,
+                     'orjson': orjson is not None and orjson.__version__},
+            'pages': run(SCALES[args.scale], args.page_sizes,
+                         args.iterations, args.seed),
+        }
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
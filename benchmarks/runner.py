@@ -0,0 +1,243 @@
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 3
+DEFAULT_THRESHOLD = 1.25
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+
+    django.setup()
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies, queries, statuses, elapsed):
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'queries_per_request': round(sum(queries) / len(queries), 2),
+        'max_queries': max(queries),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'statuses': {str(status): count
+                     for status, count in sorted(statuses.items())},
+    }
+
+
+def send(ctx, scenario, idx):
+    from django.urls import resolve
+
+    path = scenario.path(ctx, idx) if callable(scenario.path) else (
+        scenario.path)
+    data = scenario.data(ctx, idx) if callable(scenario.data) else (
+        scenario.data)
+    client = ctx.clients[scenario.client]
+    if scenario.method == 'get':
+        response = client.get(path)
+    else:
+        response = getattr(client, scenario.method)(path, data, format='json')
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return resolve(path.split('?')[0]).url_name, response
+
+
+def measure(ctx, scenario, iterations, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    if scenario.method == 'get':
+        for idx in range(warmup):
+            send(ctx, scenario, idx)
+    count = min(iterations, scenario.max_iterations or iterations)
+    latencies, queries, statuses, routes = [], [], Counter(), set()
+    started = time.perf_counter()
+    for idx in range(count):
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            route, response = send(ctx, scenario, idx)
+            latencies.append(time.perf_counter() - request_started)
+        queries.append(len(captured))
+        statuses[response.status_code] += 1
+        routes.add(route)
+        if scenario.remember and response.status_code < 300:
+            ctx.remember(scenario.remember, idx, response.json())
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, queries, statuses, elapsed), routes
+
+
+def api_routes(patterns=None):
+    from django.urls import URLResolver
+
+    if patterns is None:
+        from api.urls import urlpatterns as patterns
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= api_routes(pattern.url_patterns)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scale, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP,
+        seed=0, only=None):
+    import django
+
+    from .datasets import generate
+    from .endpoints import Context, get_scenarios
+
+    dataset_started = time.perf_counter()
+    dataset = generate(scale, seed=seed)
+    dataset_seconds = time.perf_counter() - dataset_started
+    ctx = Context(seed=seed)
+    endpoints, covered = {}, set()
+    for scenario in get_scenarios():
+        if only and scenario.name not in only:
+            continue
+        endpoints[scenario.name], routes = measure(
+            ctx, scenario, iterations, warmup)
+        covered |= routes
+    return {
+        'meta': {
+            'scale': scale._asdict(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'seed': seed,
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'created': datetime.now(timezone.utc).isoformat(),
+        },
+        'dataset': dict(dataset, seconds=round(dataset_seconds, 2)),
+        'endpoints': endpoints,
+        'uncovered_routes': sorted(api_routes() - covered) if not only
+        else [],
+    }
+
+
+def compare(baseline, report, threshold=DEFAULT_THRESHOLD):
+    regressions = []
+    for name, current in report['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * threshold:
+            regressions.append(
+                f'{name}: p95 {previous["p95_ms"]} -> {current["p95_ms"]} ms')
+        if current['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f'{name}: queries {previous["queries_per_request"]} -> '
+                f'{current["queries_per_request"]}')
+    return regressions
+
+
+def parse_args(argv):
+    from .datasets import SCALES
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark every API endpoint against a synthetic '
+                    'dataset and report latency percentiles, queries per '
+                    'request and throughput as JSON.')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO')
+    parser.add_argument('--output', type=Path,
+                        help='Write the JSON report here instead of stdout.')
+    parser.add_argument('--baseline', type=Path,
+                        help='Report from another branch to compare with.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed p95 slowdown against the baseline.')
+    parser.add_argument('--database', type=Path,
+                        help='SQLite file for the benchmark database '
+                             '(a temporary file by default).')
+    return parser.parse_args(argv)
+
+
+@contextmanager
+def benchmark_database(path=None):
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database = path or Path(workdir) / 'benchmark.sqlite3'
+        connection.settings_dict['TEST']['NAME'] = str(database)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield database
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+def quiet_slow_log():
+    # Every request is timed here, the per-request slow log is just noise.
+    logging.getLogger('api.metrics').setLevel(logging.ERROR)
+
+
+def write_report(report, output):
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        output.write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+
+
+def main(argv=None):
+    setup_django()
+    from .datasets import SCALES
+
+    args = parse_args(argv)
+    quiet_slow_log()
+    with benchmark_database(args.database):
+        report = run(SCALES[args.scale], args.iterations, args.warmup,
+                     args.seed, args.only)
+    write_report(report, args.output)
+    if args.baseline:
+        regressions = compare(
+            json.loads(args.baseline.read_text(encoding='utf-8')), report,
+            args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,182 @@
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from .runner import (benchmark_database, percentile, quiet_slow_log,
+                     setup_django, write_report)
+
+DEFAULT_DURATION = 5.0
+DEFAULT_READERS = 4
+DEFAULT_WRITERS = 2
+
+
+class Worker(threading.Thread):
+
+    def __init__(self, client, requests, deadline, seed):
+        super().__init__()
+        self.client = client
+        self.requests = requests
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.errors = Counter()
+
+    def run(self):
+        from django.db import close_old_connections, connections
+
+        try:
+            while time.perf_counter() < self.deadline:
+                send = self.rng.choice(self.requests)
+                started = time.perf_counter()
+                response = send(self.client)
+                if response.status_code >= 500:
+                    self.errors[response.status_code] += 1
+                else:
+                    self.latencies.append(time.perf_counter() - started)
+                # The test client keeps connections open, a WSGI server
+                # closes them after each request unless CONN_MAX_AGE allows.
+                close_old_connections()
+        finally:
+            connections.close_all()
+
+
+def summarize(workers, elapsed):
+    latencies = [value for worker in workers for value in worker.latencies]
+    errors = sum((worker.errors for worker in workers), Counter())
+    errors = {str(status): count for status, count in sorted(errors.items())}
+    if not latencies:
+        return {'requests': 0, 'errors': errors}
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'errors': errors,
+    }
+
+
+def make_client(user=None):
+    from rest_framework.test import APIClient
+
+    from .endpoints import Context
+
+    client = Context.client_for(user) if user else APIClient()
+    # Exceptions reach every test client through a global signal, so
+    # count server errors by status instead of letting threads re-raise.
+    client.raise_request_exception = False
+    return client
+
+
+def get_requests(seed):
+    from reviews.models import Review
+
+    rng = random.Random(seed)
+    reviews = list(Review.objects.values_list('title_id', 'pk'))
+    reviews = rng.sample(reviews, min(100, len(reviews)))
+    reads = [
+        lambda client, title=title: client.get(
+            f'/api/v1/titles/{title}/reviews/')
+        for title, _ in reviews
+    ] + [
+        lambda client, title=title: client.get(f'/api/v1/titles/{title}/')
+        for title, _ in reviews
+    ]
+    writes = [
+        lambda client, title=title, review=review: client.patch(
+            f'/api/v1/titles/{title}/reviews/{review}/',
+            {'score': rng.randint(1, 10)}, format='json')
+        for title, review in reviews
+    ]
+    return reads, writes
+
+
+def run_variant(tuned, scale, duration, readers, writers, seed):
+    from django.conf import settings
+    from django.db import connections
+    from django.test.utils import override_settings
+
+    from .datasets import generate
+    from .endpoints import Context
+
+    pragmas = settings.SQLITE_PRAGMAS if tuned else {}
+    conn_max_age = settings.CONN_MAX_AGE if tuned else 0
+    default = connections.settings['default']
+    original_max_age = default['CONN_MAX_AGE']
+    default['CONN_MAX_AGE'] = conn_max_age
+    try:
+        with override_settings(SQLITE_PRAGMAS=pragmas), benchmark_database():
+            connections['default'].close()
+            generate(scale, seed=seed)
+            ctx = Context(seed=seed)
+            reads, writes = get_requests(seed)
+            connections.close_all()
+            deadline = time.perf_counter() + duration
+            groups = {
+                'reads': [Worker(make_client(), reads, deadline, seed + idx)
+                          for idx in range(readers)],
+                'writes': [Worker(make_client(ctx.admin),
+                                  writes[idx::writers], deadline,
+                                  seed + readers + idx)
+                           for idx in range(writers)],
+            }
+            workers = groups['reads'] + groups['writes']
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+            return dict(
+                {name: summarize(group, elapsed)
+                 for name, group in groups.items()},
+                pragmas=pragmas, conn_max_age=conn_max_age)
+    finally:
+        default['CONN_MAX_AGE'] = original_max_age
+
+
+def parse_args(argv):
+    from .datasets import SCALES
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.sqlite_tuning',
+        description='Compare concurrent read/write throughput on SQLite '
+                    'with default settings and with SQLITE_PRAGMAS and '
+                    'CONN_MAX_AGE applied.')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help='Seconds to run each variant.')
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS)
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    setup_django()
+    from .datasets import SCALES
+
+    args = parse_args(argv)
+    quiet_slow_log()
+    # Failed writes are counted in the report rather than logged.
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    report = {
+        'meta': {'scale': SCALES[args.scale]._asdict(),
+                 'duration': args.duration, 'readers': args.readers,
+                 'writers': args.writers, 'seed': args.seed},
+    }
+    for name, tuned in (('default', False), ('tuned', True)):
+        report[name] = run_variant(
+            tuned, SCALES[args.scale], args.duration, args.readers,
+            args.writers, args.seed)
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from api.authentication import user_states
+    from api.cache import reset_stats
+    from api.metrics import reset_metrics
+
+    for cache in caches.all():
+        cache.clear()
+    reset_stats()
+    reset_metrics()
+    user_states.clear()
+    yield
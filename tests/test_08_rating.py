@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAPI:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        review = create_single_review(user_client, title_id, 'Плохо', 2)
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_recalculate_ratings_command(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Неплохо', 7)
+        call_command('recalculate_ratings', '--check')
+
+        Title.objects.filter(pk=title_id).update(
+            score_sum=0, reviews_count=0, rating=None
+        )
+        with pytest.raises(CommandError):
+            call_command('recalculate_ratings', '--check')
+
+        call_command('recalculate_ratings', '--batch-size', '1')
+        call_command('recalculate_ratings', '--check')
+        assert self.get_rating(client, title_id) == 7
+
+    def test_03_rating_follows_cascade_deletes(self, client, admin_client,
+                                               user, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(user_client, title_id, 'Плохо', 2)
+        assert self.get_rating(client, title_id) == 6
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)).json()
+        assert (title['rating'], title['reviews_count']) == (10, 1), (
+            'Проверьте, что рейтинг произведения пересчитывается, когда '
+            'отзывы удаляются вместе с пользователем.'
+        )
+        stats = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+            + 'stats/').json()
+        assert stats['histogram']['2'] == 0
+        call_command('recalculate_ratings', '--check')
+
+    def test_04_cascade_deletes_batch_updates(self, django_user_model,
+                                              monkeypatch):
+        import api.signals
+        from reviews.models import Comment, Review, Title
+
+        invalidations = []
+        monkeypatch.setattr(api.signals, 'invalidate',
+                            lambda *args: invalidations.append(args))
+        authors = [django_user_model.objects.create(
+            username=f'critic_{idx}', email=f'critic_{idx}@yamdb.fake')
+            for idx in range(4)]
+        titles = [Title.objects.create(name=f'Фильм {idx}', year=2000)
+                  for idx in range(3)]
+        for title in titles:
+            for author in authors:
+                review = Review.objects.create(
+                    title=title, author=author, text='Текст',
+                    score=author.pk % 10 + 1)
+                for commenter in authors:
+                    Comment.objects.create(
+                        review=review, author=commenter, text='Ответ')
+        call_command('recalculate_ratings')
+
+        def updates(context, table):
+            return [query for query in context.captured_queries
+                    if query['sql'].startswith(f'UPDATE "{table}"')]
+
+        with CaptureQueriesContext(connection) as context:
+            django_user_model.objects.filter(pk=authors[0].pk).delete()
+        assert len(updates(context, Title._meta.db_table)) == len(titles), (
+            'Проверьте, что при удалении пользователя агрегаты каждого '
+            'произведения обновляются одним запросом.'
+        )
+        assert len(updates(context, Review._meta.db_table)) == (
+            len(titles) * (len(authors) - 1))
+        assert len(invalidations) == 1
+
+        invalidations.clear()
+        with CaptureQueriesContext(connection) as context:
+            Title.objects.filter(pk__in=[titles[0].pk, titles[1].pk]).delete()
+        assert not updates(context, Title._meta.db_table), (
+            'Проверьте, что при удалении произведения не обновляются '
+            'агрегаты его отзывов.'
+        )
+        assert not updates(context, Review._meta.db_table)
+        assert not invalidations
+        call_command('recalculate_ratings', '--check')
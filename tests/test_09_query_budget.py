@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+QUERY_BUDGETS = (
+    ('/api/v1/categories/', 2),
+    ('/api/v1/genres/', 2),
+    ('/api/v1/titles/', 4),
+    ('/api/v1/titles/{title_id}/', 3),
+    ('/api/v1/titles/{title_id}/reviews/', 3),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/', 3),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 3),
+    (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/',
+        3
+    ),
+)
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author_{idx}', email=f'author_{idx}@yamdb.fake'
+        )
+        for idx in range(5)
+    ]
+    titles = []
+    for idx in range(10):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000 + idx,
+            description='Описание', category=categories[idx % 3]
+        )
+        title.genre.set(genres[:idx % 3 + 1])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5
+        )
+        for author in authors
+    ]
+    comments = [
+        Comment.objects.create(review=reviews[0], author=author, text='Да')
+        for author in authors
+    ]
+    return {
+        'title_id': titles[0].id,
+        'review_id': reviews[0].id,
+        'comment_id': comments[0].id,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    @pytest.mark.parametrize('url_template,budget', QUERY_BUDGETS)
+    def test_01_read_query_budget(self, client, catalogue, url_template,
+                                  budget, django_assert_max_num_queries):
+        url = url_template.format(**catalogue)
+        with django_assert_max_num_queries(budget):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url_template}` возвращает ответ '
+            'со статусом 200.'
+        )
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def title_with_reviews(django_user_model):
+    from reviews.models import Comment, Review, Title
+
+    title = Title.objects.create(
+        name='Сталкер', year=1979, description='Зона.'
+    )
+    reviews = []
+    for idx in range(25):
+        author = django_user_model.objects.create_user(
+            username=f'reader_{idx}', email=f'reader_{idx}@yamdb.fake'
+        )
+        reviews.append(Review.objects.create(
+            title=title, author=author, text=f'Отзыв {idx}', score=7
+        ))
+    for idx in range(12):
+        Comment.objects.create(
+            review=reviews[0], author=reviews[idx].author, text=f'{idx}'
+        )
+    call_command('recalculate_ratings')
+    return title, reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def collect(self, client, url):
+        ids = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсорной пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+            pages += 1
+        return ids, pages
+
+    def test_01_reviews_cursor_mode(self, client, title_with_reviews,
+                                    django_assert_max_num_queries):
+        title, reviews = title_with_reviews
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        ids, pages = self.collect(client, f'{url}?pagination=cursor')
+        assert ids == [review.id for review in reviews], (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы в порядке `id` без пропусков и повторов.'
+        )
+        assert pages == 3
+
+        with django_assert_max_num_queries(3) as captured:
+            response = client.get(f'{url}?pagination=cursor')
+        assert not any(
+            'COUNT(*)' in query['sql'] for query in captured.captured_queries
+        ), 'Курсорная пагинация не должна выполнять запрос `COUNT`.'
+        next_url = response.json()['next']
+        response = client.get(next_url)
+        previous = client.get(response.json()['previous']).json()
+        assert [item['id'] for item in previous['results']] == ids[:10]
+
+    def test_02_comments_cursor_mode(self, client, title_with_reviews):
+        title, reviews = title_with_reviews
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=reviews[0].id
+        )
+        ids, pages = self.collect(client, f'{url}?pagination=cursor')
+        assert len(ids) == 12 and ids == sorted(ids)
+        assert pages == 2
+
+    def test_03_page_mode_is_default(self, client, title_with_reviews):
+        title, _ = title_with_reviews
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+        data = response.json()
+        assert data['count'] == 25, (
+            'Проверьте, что по умолчанию отзывы пагинируются по номеру '
+            'страницы и ответ содержит ключ `count`.'
+        )
+        assert len(data['results']) == 10
+
+    def test_04_invalid_cursor(self, client, title_with_reviews):
+        title, _ = title_with_reviews
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?cursor=broken'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
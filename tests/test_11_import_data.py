@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+CSV_FILES = {
+    'category.csv': (
+        'id,name,slug\n1,Фильм,movie\n2,Книга,book\n3,Сезон 2021,2021\n'
+    ),
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category,category_id\n'
+        '1,Шерлок Холмс,1900,book,\n'
+        '2,Побег из Шоушенка,1994,,1\n'
+        '3,Дюна,2021,2021,\n'
+    ),
+    'genre_title.csv': (
+        'id,title_id,genre_id,genre\n1,1,1,\n2,2,1,\n3,2,,comedy\n'
+    ),
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+        '102,100,hundred@yamdb.fake,user,,,\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,author_id,score,pub_date\n'
+        '1,1,Отлично,,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,capt_obvious,,5,2019-09-24T21:08:21.567Z\n'
+        '3,2,Шедевр,100,,9,\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,capt_obvious,2019-09-25T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportData:
+
+    def test_01_import_csv(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        for name, content in CSV_FILES.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        call_command('import_data', str(tmp_path), '--batch-size', '2')
+
+        assert Title.objects.count() == 3
+        assert Title.objects.get(pk=1).category.slug == 'book'
+        assert Title.objects.get(pk=2).category.slug == 'movie'
+        assert Title.objects.get(pk=3).category.slug == '2021', (
+            'Проверьте, что значение `category` всегда считается slug, '
+            'а id передаётся в `category_id`.'
+        )
+        assert set(
+            Title.objects.get(pk=2).genre.values_list('slug', flat=True)
+        ) == {'drama', 'comedy'}
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что при импорте сохраняется дата публикации отзыва.'
+        )
+        assert Comment.objects.get(pk=1).author.username == 'capt_obvious'
+        assert Review.objects.get(pk=1).author.username == 'bingobongo'
+        assert Review.objects.get(pk=3).author.username == '100', (
+            'Проверьте, что значение `author` всегда считается username, '
+            'а id передаётся в `author_id`.'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            2, 15, 7.5
+        ), 'Проверьте, что после импорта пересчитывается рейтинг.'
+
+    def test_02_import_jsonl(self, tmp_path):
+        from reviews.models import Genre
+
+        lines = [{'name': 'Ужасы', 'slug': 'horror'},
+                 {'name': 'Триллер', 'slug': 'thriller'}]
+        (tmp_path / 'genre.jsonl').write_text(
+            '\n'.join(json.dumps(line) for line in lines), encoding='utf-8'
+        )
+        call_command('import_data', str(tmp_path), '--format', 'jsonl')
+        assert set(Genre.objects.values_list('slug', flat=True)) == {
+            'horror', 'thriller'
+        }
+
+    def test_03_unknown_reference(self, tmp_path):
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Без категории,2000,missing\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError):
+            call_command('import_data', str(tmp_path))
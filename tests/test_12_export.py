@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ExportAPI:
+
+    EXPORT_URL = '/api/v1/export/titles/'
+
+    def prepare(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отличный фильм', 9
+        ).json()
+        create_single_comment(
+            admin_client, titles[0]['id'], review['id'], 'Согласен'
+        )
+        return titles
+
+    def test_01_export_permissions(self, client, user_client):
+        response = client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.EXPORT_URL}` возвращает ответ со статусом 401.'
+        )
+        response = user_client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что GET-запрос пользователя с ролью `user` к '
+            f'`{self.EXPORT_URL}` возвращает ответ со статусом 403.'
+        )
+
+    def test_02_export_jsonl(self, admin_client, user_client):
+        titles = self.prepare(admin_client, user_client)
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдаёт данные потоком.'
+        )
+        documents = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [doc['id'] for doc in documents] == [
+            title['id'] for title in titles
+        ]
+        first = documents[0]
+        assert first['category'] == titles[0]['category']
+        assert first['genre'] == sorted(titles[0]['genre'])
+        assert first['rating'] == 9
+        assert first['reviews'][0]['score'] == 9
+        assert first['reviews'][0]['comments'][0]['text'] == 'Согласен'
+        assert documents[1]['reviews'] == []
+
+    def test_03_export_csv(self, admin_client, user_client):
+        self.prepare(admin_client, user_client)
+        response = admin_client.get(
+            f'{self.EXPORT_URL}?file_format=csv', HTTP_ACCEPT='text/csv'
+        )
+        assert response.status_code == HTTPStatus.OK
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 2
+        assert rows[0]['score'] == '9'
+        assert rows[1]['review_id'] == ''
+
+        response = admin_client.get(f'{self.EXPORT_URL}?file_format=xml')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_chunks_do_not_change_documents(self, django_user_model):
+        from api.export import iter_title_documents
+        from reviews.models import Comment, Review, Title
+
+        users = [django_user_model.objects.create(
+            username=f'reader_{idx}', email=f'reader_{idx}@yamdb.fake')
+            for idx in range(3)]
+        titles = [Title.objects.create(name=f'Книга {idx}', year=2000)
+                  for idx in range(4)]
+        for author in users:
+            for title in reversed(titles[1:]):
+                review = Review.objects.create(
+                    title=title, author=author, text='Текст', score=5)
+                for commenter in users[:title.pk % 3]:
+                    Comment.objects.create(
+                        review=review, author=commenter, text='Ответ')
+
+        expected = list(iter_title_documents(chunk_size=100))
+        assert [len(doc['reviews']) for doc in expected] == [0, 3, 3, 3]
+        for chunk_size in (1, 2, 5):
+            assert list(iter_title_documents(chunk_size)) == expected, (
+                'Проверьте, что выгрузка не зависит от размера пачки '
+                'при потоковом чтении отзывов и комментариев.'
+            )
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client,
+                                         django_assert_num_queries):
+        create_categories(admin_client)
+        first = client.get(f'{self.CATEGORIES_URL}?search=Ф&page=1')
+        with django_assert_num_queries(0):
+            second = client.get(f'{self.CATEGORIES_URL}?page=1&search=Ф')
+        assert first.json() == second.json(), (
+            'Проверьте, что повторный GET-запрос с теми же параметрами '
+            'в другом порядке отдаётся из кэша.'
+        )
+        stats = admin_client.get(self.STATS_URL).json()
+        assert stats['categories'] == {'hits': 1, 'misses': 1}
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, categories, _ = create_titles(admin_client)
+        client.get(self.CATEGORIES_URL)
+        response = admin_client.delete(
+            f'{self.CATEGORIES_URL}{categories[0]["slug"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(self.CATEGORIES_URL)
+        assert response.json()['count'] == len(categories) - 1, (
+            'Проверьте, что удаление категории сбрасывает кэш списка '
+            'категорий.'
+        )
+
+        client.get(self.TITLES_URL)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        data = client.get(self.TITLES_URL).json()
+        ratings = {title['id']: title['rating'] for title in data['results']}
+        assert ratings[titles[0]['id']] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кэш списка '
+            'произведений.'
+        )
+
+    def test_03_authenticated_requests_bypass_cache(self, admin_client):
+        create_categories(admin_client)
+        admin_client.get(self.CATEGORIES_URL)
+        assert admin_client.get(self.STATS_URL).json() == {}
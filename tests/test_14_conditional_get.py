@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_etag_and_not_modified(self, client, admin_client,
+                                      django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит заголовки `ETag` '
+            'и `Last-Modified`.'
+        )
+        with django_assert_max_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304.'
+        )
+        assert response.get('ETag') == etag
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=client.get(url)['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_etag_changes_on_write(self, client, admin_client,
+                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        title_etag = client.get(title_url)['ETag']
+        reviews_etag = client.get(reviews_url)['ETag']
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` произведения меняется после изменения '
+            'его рейтинга.'
+        )
+        assert response.json()['rating'] == 8
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` списка отзывов меняется после '
+            'добавления отзыва.'
+        )
+        assert response['ETag'] != reviews_etag
+
+    def test_03_etag_depends_on_query(self, client, admin_client):
+        create_titles(admin_client)
+        first = client.get('/api/v1/titles/?year=1984')['ETag']
+        second = client.get('/api/v1/titles/?year=1988')['ETag']
+        assert first != second
+
+    def test_04_title_list_etag_without_scan(self, client, admin_client,
+                                             user_client,
+                                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что `ETag` списка произведений строится без '
+            'запросов к базе данных.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response['ETag'] == etag
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` списка произведений меняется после '
+            'изменения рейтинга.'
+        )
+        assert response['ETag'] != etag
+
+    def test_05_title_list_etag_survives_cache_loss(self, client,
+                                                    admin_client):
+        from api.cache import get_cache
+
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        get_cache().clear()
+        etag = client.get(url)['ETag']
+        response = admin_client.post(url, data={
+            'name': 'Новое произведение', 'year': 2000, 'description': 'Текст',
+            'genre': titles[0]['genre'], 'category': titles[0]['category']})
+        assert response.status_code == HTTPStatus.CREATED
+        get_cache().clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после очистки кеша версия списка не '
+            'начинается заново и старый `ETag` не совпадает.'
+        )
+        assert response['ETag'] != etag
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+from smtplib import SMTPException, SMTPServerDisconnected
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Mail server is down')
+
+
+class UnreachableBackend(BaseEmailBackend):
+
+    def open(self):
+        raise ConnectionRefusedError('Connection refused')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('Соединение не открыто')
+
+
+class IdleTimeoutBackend(BaseEmailBackend):
+    # Every connection delivers one message, then the server hangs up.
+    delivered = []
+
+    def send_messages(self, email_messages):
+        if getattr(self, 'used', False):
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        self.used = True
+        IdleTimeoutBackend.delivered.extend(email_messages)
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, count):
+        for idx in range(count):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': f'queued_{idx}@yamdb.fake',
+                'username': f'queued_{idx}'
+            })
+            assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues_email(self, client):
+        from core.models import OutgoingEmail
+
+        self.signup(client, 7)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо с кодом подтверждения не отправляется '
+            'во время обработки запроса, а ставится в очередь.'
+        )
+        assert OutgoingEmail.objects.filter(
+            status=OutgoingEmail.Status.PENDING
+        ).count() == 7
+
+        call_command('send_outbox', '--once', '--workers', '3',
+                     '--batch-size', '2')
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(
+            f'queued_{idx}@yamdb.fake' for idx in range(7)
+        )
+        assert OutgoingEmail.objects.filter(
+            status=OutgoingEmail.Status.SENT
+        ).count() == 7
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == 7
+
+    def test_02_failed_delivery_is_retried_with_backoff(self, client,
+                                                        settings):
+        from core.models import OutgoingEmail
+
+        self.signup(client, 1)
+        settings.EMAIL_BACKEND = 'tests.test_15_email_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        call_command('send_outbox', '--once')
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.PENDING
+        assert email.attempts == 1
+        assert 'Mail server is down' in email.last_error
+        assert email.next_attempt_at > email.created
+
+        call_command('send_outbox', '--once')
+        assert OutgoingEmail.objects.get().attempts == 1, (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=email.created)
+        call_command('send_outbox', '--once')
+        assert OutgoingEmail.objects.get().status == (
+            OutgoingEmail.Status.FAILED
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend')
+        OutgoingEmail.objects.update(status=OutgoingEmail.Status.PENDING,
+                                     next_attempt_at=email.created)
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == 1
+
+    def test_03_unreachable_server(self, client, settings):
+        from core.models import OutgoingEmail
+
+        self.signup(client, 2)
+        settings.EMAIL_BACKEND = (
+            'tests.test_15_email_outbox.UnreachableBackend')
+        call_command('send_outbox', '--once', '--workers', '1')
+        expected = [(OutgoingEmail.Status.PENDING, 1)] * 2
+        assert list(OutgoingEmail.objects.values_list(
+            'status', 'attempts')) == expected, (
+            'Проверьте, что недоступный почтовый сервер считается неудачной '
+            'попыткой отправки.'
+        )
+
+    def test_04_closed_connection_is_reopened(self, client, settings):
+        from core.models import OutgoingEmail
+
+        self.signup(client, 3)
+        settings.EMAIL_BACKEND = (
+            'tests.test_15_email_outbox.IdleTimeoutBackend')
+        IdleTimeoutBackend.delivered = []
+        call_command('send_outbox', '--once', '--workers', '1')
+        assert len(IdleTimeoutBackend.delivered) == 3
+        expected = [(OutgoingEmail.Status.SENT, 1)] * 3
+        assert list(OutgoingEmail.objects.values_list(
+            'status', 'attempts')) == expected, (
+            'Проверьте, что письмо повторно отправляется через новое '
+            'соединение, если сервер закрыл старое.'
+        )
@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16StatelessAuth:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_CATEGORIES = '/api/v1/categories/'
+    URL_USERS = '/api/v1/users/'
+    URL_ME = '/api/v1/users/me/'
+
+    def get_client(self, client, django_user_model, username, role):
+        client.post(self.URL_SIGNUP, data={
+            'email': f'{username}@yamdb.fake', 'username': username
+        })
+        user = django_user_model.objects.get(username=username)
+        user.role = role
+        user.save()
+        response = client.post(self.URL_TOKEN, data={
+            'username': username,
+            'confirmation_code': user.confirmation_code
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.URL_TOKEN}` с верным кодом '
+            'подтверждения возвращает ответ со статусом 200.'
+        )
+        api_client = APIClient()
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]["access"]}')
+        return user, api_client
+
+    def test_01_safe_request_does_not_load_user(self, client,
+                                                django_user_model):
+        _, api_client = self.get_client(
+            client, django_user_model, 'reader', 'user')
+        api_client.get(self.URL_CATEGORIES)
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(self.URL_CATEGORIES)
+        assert response.status_code == HTTPStatus.OK
+        users_table = django_user_model._meta.db_table
+        assert not any(
+            users_table in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный GET-запрос с токеном пользователя '
+            'проходит аутентификацию без обращения к таблице пользователей.'
+        )
+
+    def test_02_role_change_revokes_write_access(self, client,
+                                                 django_user_model):
+        admin, api_client = self.get_client(
+            client, django_user_model, 'manager', 'admin')
+        response = api_client.post(
+            self.URL_CATEGORIES, data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin.role = 'user'
+        admin.save()
+        response = api_client.post(
+            self.URL_CATEGORIES, data={'name': 'Книга', 'slug': 'books'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли пользователя изменяющие запросы '
+            'проверяют актуальную роль, а не роль из токена.'
+        )
+
+    def test_03_deleted_user_cannot_write(self, client, django_user_model):
+        admin, api_client = self.get_client(
+            client, django_user_model, 'leaver', 'admin')
+        admin.delete()
+        response = api_client.post(
+            self.URL_CATEGORIES, data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя не даёт выполнить '
+            'изменяющий запрос.'
+        )
+
+    def test_04_deleted_user_cannot_read(self, client, django_user_model):
+        admin, api_client = self.get_client(
+            client, django_user_model, 'gone', 'admin')
+        assert api_client.get(self.URL_USERS).status_code == HTTPStatus.OK
+        admin.delete()
+        for url in (self.URL_USERS, self.URL_ME, self.URL_CATEGORIES):
+            response = api_client.get(url)
+            assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+                'Проверьте, что токен удалённого пользователя не даёт '
+                f'выполнить GET-запрос к `{url}`.'
+            )
+
+    def test_05_inactive_user_cannot_read(self, client, django_user_model):
+        admin, api_client = self.get_client(
+            client, django_user_model, 'paused', 'admin')
+        assert api_client.get(self.URL_USERS).status_code == HTTPStatus.OK
+        admin.is_active = False
+        admin.save()
+        response = api_client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен деактивированного пользователя не даёт '
+            'доступа к данным.'
+        )
+
+    def test_06_role_change_revokes_read_access(self, client,
+                                                django_user_model):
+        admin, api_client = self.get_client(
+            client, django_user_model, 'former', 'admin')
+        assert api_client.get(self.URL_USERS).status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        response = api_client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли GET-запросы проверяют '
+            'актуальную роль, а не роль из токена.'
+        )
+
+    def test_07_lazy_user_of_deleted_account(self, django_user_model):
+        from rest_framework.exceptions import AuthenticationFailed
+
+        from api.authentication import TokenUser
+
+        user = django_user_model.objects.create(
+            username='ghost', email='ghost@yamdb.fake')
+        token_user = TokenUser(user.pk, {'username': 'ghost'})
+        user.delete()
+        with pytest.raises(AuthenticationFailed):
+            token_user.email
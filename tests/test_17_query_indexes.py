@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    author = django_user_model.objects.create_user(
+        username='author', email='author@yamdb.fake')
+    title = Title.objects.create(
+        name='Произведение', year=2000, description='Описание',
+        category=category)
+    title.genre.add(genre)
+    review = Review.objects.create(
+        title=title, author=author, text='Отзыв', score=5)
+    Comment.objects.create(review=review, author=author, text='Да')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17QueryIndexes:
+
+    @pytest.mark.parametrize('index_name', (
+        'category_name_idx',
+        'genre_name_idx',
+        'title_name_idx',
+        'title_year_name_idx',
+        'title_category_name_idx',
+        'review_title_id_idx',
+        'comment_review_id_idx',
+    ))
+    def test_01_index_is_used(self, catalogue, index_name):
+        out = StringIO()
+        call_command('explain_queries', '--compare', stdout=out)
+        plans = out.getvalue()
+        after = [line for line in plans.splitlines()
+                 if line.strip().startswith('after:')]
+        before = [line for line in plans.splitlines()
+                  if line.strip().startswith('before:')]
+        assert any(index_name in line for line in after), (
+            f'Проверьте, что индекс `{index_name}` используется хотя бы '
+            'одним запросом эндпоинтов чтения.'
+        )
+        assert not any(index_name in line for line in before)
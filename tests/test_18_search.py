@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.fixture
+def library(django_user_model):
+    from reviews.models import Comment, Review, Title
+
+    author = django_user_model.objects.create_user(
+        username='reader', email='reader@yamdb.fake')
+    dune = Title.objects.create(
+        name='Дюна', year=1965, description='Пустынная планета Арракис')
+    desert = Title.objects.create(
+        name='Белое солнце пустыни', year=1970,
+        description='Красноармеец Сухов и дюна')
+    Title.objects.create(name='Солярис', year=1961, description='Океан')
+    review = Review.objects.create(
+        title=dune, author=author, text='Лучшая книга про пустыню', score=10,
+        comments_count=1)
+    comment = Comment.objects.create(
+        review=review, author=author, text='Согласен, дюна прекрасна')
+    return {'dune': dune, 'desert': desert, 'review': review,
+            'comment': comment}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Search:
+
+    URL_SEARCH = '/api/v1/search/'
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_search_ranks_across_types(self, client, library):
+        response = client.get(self.URL_SEARCH, {'q': 'дюна'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.URL_SEARCH}` доступен без '
+            'токена и возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        hits = [(hit['type'], hit['id']) for hit in data['results']]
+        assert data['count'] == 3
+        assert hits[0] == ('title', library['dune'].id), (
+            'Проверьте, что совпадение в названии произведения ранжируется '
+            'выше совпадения в описании.'
+        )
+        assert set(hits) == {
+            ('title', library['dune'].id),
+            ('title', library['desert'].id),
+            ('comment', library['comment'].id),
+        }
+        comment = next(
+            hit for hit in data['results'] if hit['type'] == 'comment')
+        assert comment['review_id'] == library['review'].id
+        assert comment['title_id'] == library['dune'].id
+        assert 'дюна' in comment['snippet']
+
+    def test_02_prefix_and_type_filter(self, client, library):
+        response = client.get(
+            self.URL_SEARCH, {'q': 'пусты*', 'type': ['review']})
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [(hit['type'], hit['id']) for hit in results] == [
+            ('review', library['review'].id)
+        ], (
+            'Проверьте, что запрос с `*` на конце ищет по префиксу, а '
+            'параметр `type` ограничивает типы результатов.'
+        )
+        assert results[0]['title_id'] == library['dune'].id
+
+    def test_03_index_follows_writes(self, client, library):
+        review = library['review']
+        review.text = 'Скучный роман'
+        review.save()
+        response = client.get(self.URL_SEARCH, {'q': 'скучный'})
+        assert [hit['id'] for hit in response.json()['results']] == [
+            review.id
+        ]
+        response = client.get(self.URL_SEARCH, {'q': 'пустыню'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'текста отзыва.'
+        )
+        library['comment'].delete()
+        response = client.get(
+            self.URL_SEARCH, {'q': 'прекрасна', 'type': 'comment'})
+        assert response.json()['count'] == 0
+
+    def test_04_viewset_search_filter(self, client, library):
+        response = client.get(self.URL_TITLES, {'search': 'дюна'})
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()['results']] == [
+            library['dune'].id, library['desert'].id
+        ], (
+            f'Проверьте, что `{self.URL_TITLES}?search=` возвращает '
+            'произведения, отсортированные по релевантности.'
+        )
+        url = f'{self.URL_TITLES}{library["dune"].id}/reviews/'
+        response = client.get(url, {'search': 'книга'})
+        assert [review['id'] for review in response.json()['results']] == [
+            library['review'].id
+        ]
+        response = client.get(url, {'search': 'океан'})
+        assert response.json()['count'] == 0
+
+    def test_05_query_is_required(self, client):
+        response = client.get(self.URL_SEARCH)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_like_backend_matches(self, client, library, settings):
+        settings.SEARCH_BACKEND = 'reviews.search.LikeSearchBackend'
+        response = client.get(self.URL_SEARCH, {'q': 'прекрасна'})
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            (hit['type'], hit['id']) for hit in response.json()['results']
+        ] == [('comment', library['comment'].id)]
+        response = client.get(self.URL_TITLES, {'search': 'солн*'})
+        assert [title['id'] for title in response.json()['results']] == [
+            library['desert'].id
+        ]
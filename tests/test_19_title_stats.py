@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleStats:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stats(self, client, title_id):
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/stats/` '
+            'доступен без токена и возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_histogram_follows_review_changes(
+            self, client, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(moderator_client, title_id, 'Хорошо', 7)
+        review = create_single_review(user_client, title_id, 'Плохо', 2)
+
+        stats = self.get_stats(client, title_id)
+        assert stats['count'] == 3
+        assert stats['median'] == 7
+        assert stats['histogram'] == {
+            str(score): int(score in (2, 7, 10)) for score in range(1, 11)
+        }, (
+            'Проверьте, что гистограмма оценок обновляется при создании '
+            'отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']),
+            data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram']['2'] == 0
+        assert stats['histogram']['10'] == 2
+        assert stats['median'] == 10
+
+        user_client.delete(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']))
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram']['10'] == 1
+        assert stats['count'] == 2
+        assert stats['mean'] == 8.5
+        assert stats['median'] == 8.5
+        call_command('recalculate_ratings', '--check')
+
+        empty = self.get_stats(client, titles[1]['id'])
+        assert empty['count'] == 0
+        assert empty['median'] is None
+
+    def test_02_stats_embedded_on_request(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Неплохо', 6)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+
+        assert 'stats' not in client.get(url).json()
+        response = client.get(url, {'stats': 'true'})
+        assert response.json()['stats'] == self.get_stats(client, title_id), (
+            'Проверьте, что с параметром `stats=true` статистика оценок '
+            'встраивается в ответ о произведении.'
+        )
+        response = client.get('/api/v1/titles/', {'stats': '1'})
+        assert all('stats' in title for title in response.json()['results'])
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Counters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_counters_follow_writes(self, client, admin_client,
+                                       user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            admin_client, title_id, 'Отлично', 10).json()['id']
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id)
+        comment_ids = [
+            user_client.post(comments_url, data={'text': f'{idx}'})
+            .json()['id']
+            for idx in range(3)
+        ]
+        user_client.delete(f'{comments_url}{comment_ids[0]}/')
+
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)).json()
+        assert title['reviews_count'] == 2, (
+            'Проверьте, что ответ о произведении содержит поле '
+            '`reviews_count` с числом отзывов.'
+        )
+        reviews = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)).json()
+        counts = {review['id']: review['comments_count']
+                  for review in reviews['results']}
+        assert counts[review_id] == 2, (
+            'Проверьте, что отзыв содержит поле `comments_count`, которое '
+            'обновляется при создании и удалении комментариев.'
+        )
+        assert reviews['count'] == 2
+        assert client.get(comments_url).json()['count'] == 2
+        call_command('recalculate_ratings', '--check')
+
+    def test_02_nested_lists_skip_count_query(self, client, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отлично', 10).json()['id']
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id),
+        )
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert not any(
+                'COUNT(*)' in query['sql']
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` берёт общее число '
+                'объектов из сохранённого счётчика, а не из `COUNT(*)`.'
+            )
+        response = client.get(urls[0], {'search': 'отлично'})
+        assert response.json()['count'] == 1
+
+    def test_03_counters_follow_cascade_deletes(self, client, admin_client,
+                                                user, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            admin_client, title_id, 'Отлично', 10).json()['id']
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id)
+        admin_client.post(comments_url, data={'text': 'Согласен'})
+        user_client.post(comments_url, data={'text': 'Не согласен'})
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        reviews = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)).json()
+        assert reviews['count'] == len(reviews['results']) == 1, (
+            'Проверьте, что `reviews_count` обновляется, когда отзывы '
+            'удаляются вместе с пользователем.'
+        )
+        assert reviews['results'][0]['comments_count'] == 1
+        comments = client.get(comments_url).json()
+        assert comments['count'] == len(comments['results']) == 1, (
+            'Проверьте, что `comments_count` обновляется, когда комментарии '
+            'удаляются вместе с пользователем.'
+        )
+        call_command('recalculate_ratings', '--check')
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleRanking:
+
+    TITLES_URL = '/api/v1/titles/'
+    TOP_URL = '/api/v1/titles/top/'
+
+    @pytest.fixture
+    def ranked(self, admin_client, user_client, moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Так себе', 6)
+        create_single_review(user_client, first, 'Неплохо', 8)
+        create_single_review(moderator_client, second, 'Отлично', 10)
+        unrated = Title.objects.create(
+            name='Без отзывов', year=2001, description='',
+            category_id=Title.objects.get(pk=first).category_id)
+        return {'first': first, 'second': second, 'unrated': unrated.id}
+
+    def test_01_ordering_param(self, client, ranked):
+        response = client.get(self.TITLES_URL, {'ordering': '-rating'})
+        assert response.status_code == HTTPStatus.OK
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids[:2] == [ranked['second'], ranked['first']], (
+            f'Проверьте, что `{self.TITLES_URL}?ordering=-rating` сортирует '
+            'произведения по убыванию рейтинга.'
+        )
+        response = client.get(
+            self.TITLES_URL, {'ordering': '-reviews_count,year'})
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids[0] == ranked['first']
+
+    def test_02_top_titles(self, client, ranked):
+        response = client.get(self.TOP_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.TOP_URL}` доступен без токена.'
+        )
+        assert [title['id'] for title in response.json()] == [
+            ranked['second'], ranked['first']
+        ], (
+            'Проверьте, что топ по рейтингу отсортирован по убыванию '
+            'рейтинга и не содержит произведений без отзывов.'
+        )
+        response = client.get(self.TOP_URL, {'by': 'popularity', 'limit': 1})
+        assert [title['id'] for title in response.json()] == [
+            ranked['first']
+        ]
+        category = client.get(
+            f'{self.TITLES_URL}{ranked["second"]}/').json()['category']
+        response = client.get(self.TOP_URL, {'category': category['slug']})
+        assert all(
+            title['category'] == category for title in response.json()
+        )
+        response = client.get(self.TOP_URL, {'limit': 1000})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(self.TOP_URL, {'year': 'abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректные фильтры топа возвращают ответ '
+            'со статусом 400.'
+        )
+        assert 'year' in response.json()
+
+    def test_03_top_titles_cache(self, client, user_superuser_client,
+                                 ranked):
+        from api.cache import get_stats
+
+        client.get(self.TOP_URL)
+        client.get(self.TOP_URL)
+        assert get_stats()['titles'] == {'hits': 1, 'misses': 1}, (
+            'Проверьте, что ответ эндпоинта топа кэшируется.'
+        )
+        create_single_review(user_superuser_client, ranked['unrated'],
+                             'Шедевр', 10)
+        response = client.get(self.TOP_URL)
+        assert response.json()[0]['id'] == ranked['unrated'], (
+            'Проверьте, что кэш топа сбрасывается после нового отзыва.'
+        )
@@ -0,0 +1,75 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22WeightedRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    TOP_URL = '/api/v1/titles/top/'
+
+    def get_title(self, client, title_id):
+        return client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)).json()
+
+    def test_01_weighted_rating_shrinks_to_prior(
+            self, client, settings, django_user_model, admin_client,
+            user_client):
+        from reviews.models import Review, Title
+
+        settings.RATING_PRIOR_WEIGHT = 2
+        titles, _, _ = create_titles(admin_client)
+        lonely, popular = titles[0]['id'], titles[1]['id']
+        flop = Title.objects.create(name='Провал', year=2000, description='')
+        unrated = Title.objects.create(
+            name='Без отзывов', year=2001, description='')
+        for idx in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'fan_{idx}', email=f'fan_{idx}@yamdb.fake')
+            if idx % 2:
+                Review.objects.create(
+                    title_id=popular, author=author, text='Хорошо', score=9)
+            else:
+                Review.objects.create(
+                    title=flop, author=author, text='Плохо', score=3)
+        call_command('recalculate_ratings')
+        create_single_review(user_client, lonely, 'Шедевр', 10)
+
+        prior_mean = 6
+        assert self.get_title(client, lonely)['weighted_rating'] == (
+            pytest.approx((2 * prior_mean + 10) / 3)
+        ), (
+            'Проверьте, что взвешенный рейтинг пересчитывается при создании '
+            'отзыва по формуле байесовского среднего.'
+        )
+        assert self.get_title(client, lonely)['rating'] == 10
+        response = client.get(self.TOP_URL, {'by': 'weighted'})
+        assert [title['id'] for title in response.json()] == [
+            popular, lonely, flop.id
+        ], (
+            'Проверьте, что в топе по взвешенному рейтингу произведение с '
+            'большим числом отзывов обгоняет произведение с одним отзывом.'
+        )
+
+        out = StringIO()
+        call_command('update_weighted_ratings', '--batch-size', '1',
+                     '--prior-weight', '4', stdout=out)
+        mean = (6 * 3 + 6 * 9 + 10) / 13
+        assert Title.objects.get(pk=lonely).weighted_rating == (
+            pytest.approx((4 * mean + 10) / 5)
+        )
+        assert self.get_title(client, unrated.id)['weighted_rating'] is None
+
+    def test_02_ordering_by_weighted_rating(self, client, admin_client,
+                                            user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Плохо', 2)
+        create_single_review(user_client, titles[1]['id'], 'Хорошо', 8)
+        response = client.get(
+            '/api/v1/titles/', {'ordering': '-weighted_rating'})
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids[:2] == [titles[1]['id'], titles[0]['id']]
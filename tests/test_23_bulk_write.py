@@ -0,0 +1,172 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkWrite:
+
+    TITLES_BULK_URL = '/api/v1/titles/bulk/'
+    GENRES_BULK_URL = '/api/v1/genres/bulk/'
+    CATEGORIES_BULK_URL = '/api/v1/categories/bulk/'
+
+    def test_01_bulk_create_titles(self, admin_client,
+                                   django_assert_max_num_queries):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {'name': f'Фильм {idx}', 'year': 2000 + idx, 'description': '-',
+             'genre': [genres[idx % 3]['slug'], genres[0]['slug']],
+             'category': categories[idx % 2]['slug']}
+            for idx in range(50)
+        ]
+        with django_assert_max_num_queries(12):
+            response = admin_client.post(
+                self.TITLES_BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` создаёт произведения пачкой.'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            item['name'] for item in data
+        ]
+        assert Title.objects.count() == 50
+        title = Title.objects.get(pk=created[7]['id'])
+        assert title.category.slug == categories[1]['slug']
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            genres[1]['slug'], genres[0]['slug']
+        }, (
+            'Проверьте, что при пакетном создании заполняется связь '
+            'произведений с жанрами.'
+        )
+        assert created[7]['genre'] == [
+            {'name': genre.name, 'slug': genre.slug}
+            for genre in title.genre.all()
+        ]
+
+    def test_02_bulk_create_validates_everything(self, admin_client):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {'name': 'Годный', 'year': 2000, 'description': '-',
+             'genre': [genres[0]['slug']], 'category': categories[0]['slug']},
+            {'name': 'Без жанра', 'year': 2000, 'description': '-',
+             'genre': ['no-such-genre'], 'category': categories[0]['slug']},
+            {'name': 'Без года', 'description': '-', 'genre': []},
+        ]
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[:2] == [{}, {}]
+        assert set(errors[2]) == {'year', 'category'}
+        assert Title.objects.count() == 0, (
+            'Проверьте, что при ошибке в любом элементе пакета ни одно '
+            'произведение не создаётся.'
+        )
+        data.pop(2)
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == [{}, {'genre': [
+            'Object with slug=no-such-genre does not exist.'
+        ]}]
+        assert Title.objects.count() == 0
+
+    def test_03_bulk_update_and_delete_titles(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        response = admin_client.patch(self.TITLES_BULK_URL, data=[
+            {'id': first, 'name': 'Терминатор 2',
+             'genre': [genres[2]['slug']]},
+            {'id': second, 'year': 1990, 'category': categories[0]['slug']},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [first, second]
+        first_title = client.get(f'/api/v1/titles/{first}/').json()
+        assert first_title['name'] == 'Терминатор 2'
+        assert first_title['genre'] == [genres[2]]
+        second_title = Title.objects.get(pk=second)
+        assert (second_title.year, second_title.category.slug) == (
+            1990, categories[0]['slug']
+        ), (
+            'Проверьте, что PATCH-запрос к пакетному эндпоинту меняет только '
+            'переданные поля.'
+        )
+        assert second_title.name == titles[1]['name']
+
+        response = admin_client.patch(self.TITLES_BULK_URL, data=[
+            {'id': first, 'year': 1991}, {'id': 0, 'year': 1991},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert list(response.json()[1]) == ['id']
+        assert Title.objects.get(pk=first).year == titles[0]['year']
+
+        response = admin_client.delete(
+            self.TITLES_BULK_URL, data=[first, 0], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.delete(
+            self.TITLES_BULK_URL, data=[first, second], format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert not Title.objects.exists()
+
+    def test_04_bulk_genres_and_categories(self, client, admin_client):
+        from reviews.models import Genre
+
+        titles, categories, genres = create_titles(admin_client)
+        data = [{'name': 'Вестерн', 'slug': 'western'},
+                {'name': 'Нуар', 'slug': 'noir'}]
+        response = admin_client.post(
+            self.GENRES_BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == data
+        response = admin_client.post(self.GENRES_BULK_URL, data=[
+            {'name': 'Ещё нуар', 'slug': 'noir'},
+            {'name': 'Мюзикл', 'slug': 'musical'},
+            {'name': 'Тоже мюзикл', 'slug': 'musical'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пакетное создание жанров проверяет уникальность '
+            'slug как среди существующих жанров, так и внутри пакета.'
+        )
+        assert [list(error) for error in response.json()] == [
+            ['slug'], [], ['slug']
+        ]
+        assert not Genre.objects.filter(slug='musical').exists()
+
+        title_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        etag = client.get(title_url)['ETag']
+        response = admin_client.patch(self.CATEGORIES_BULK_URL, data=[
+            {'slug': categories[1]['slug'], 'name': 'Кино'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(title_url).json()['category']['name'] == 'Кино'
+        assert client.get(title_url)['ETag'] != etag
+
+        response = admin_client.delete(
+            self.CATEGORIES_BULK_URL, data=[categories[1]['slug']],
+            format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(title_url).json()['category'] is None
+
+    def test_05_bulk_requires_admin(self, client, user_client):
+        data = [{'name': 'Вестерн', 'slug': 'western'}]
+        for method in ('post', 'patch', 'delete'):
+            response = getattr(user_client, method)(
+                self.GENRES_BULK_URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что пакетные эндпоинты доступны только '
+                'администратору.'
+            )
+        response = client.post(self.GENRES_BULK_URL, data=data,
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
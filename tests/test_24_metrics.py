@@ -0,0 +1,99 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Metrics:
+
+    URL_METRICS = '/api/v1/metrics/'
+
+    def test_01_metrics_endpoint(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        client.get('/api/v1/titles/0/')
+
+        assert client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что эндпоинт `{self.URL_METRICS}` доступен только '
+            'администратору.'
+        )
+        response = admin_client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        lines = response.content.decode().splitlines()
+        list_labels = 'view="TitleViewSet",action="list",method="GET"'
+        assert (
+            f'api_requests_total{{{list_labels},status="200"}} 2' in lines
+        ), (
+            'Проверьте, что метрики запросов группируются по viewset и '
+            'действию.'
+        )
+        assert (
+            'api_requests_total{view="TitleViewSet",action="retrieve",'
+            'method="GET",status="404"} 1' in lines
+        )
+        assert f'api_request_duration_seconds_count{{{list_labels}}} 2' in (
+            lines
+        )
+        assert (
+            f'api_request_duration_seconds_bucket{{{list_labels},le="+Inf"}} '
+            '2' in lines
+        )
+        for metric in ('api_request_db_queries', 'api_request_db_seconds',
+                       'api_response_render_seconds',
+                       'api_response_size_bytes'):
+            assert f'{metric}_count{{{list_labels}}} 2' in lines, (
+                f'Проверьте, что метрика `{metric}` собирается для каждого '
+                'запроса.'
+            )
+        assert (
+            f'api_response_serialize_seconds_count{{{list_labels}}} 1'
+            in lines
+        ), (
+            'Проверьте, что время сериализации собирается отдельной '
+            'метрикой и не учитывается для ответов из кеша.'
+        )
+        assert (
+            'api_response_serialize_seconds_count{view="TitleViewSet",'
+            'action="retrieve",method="GET"} 1' in lines
+        )
+        queries = next(line for line in lines if line.startswith(
+            f'api_request_db_queries_sum{{{list_labels}}}'))
+        assert float(queries.split()[-1]) > 0
+        assert 'api_cache_misses_total{namespace="titles"} 1' in lines
+        assert 'api_cache_hits_total{namespace="titles"} 1' in lines
+
+    def test_02_slow_request_log(self, client, admin_client, settings,
+                                 caplog):
+        create_titles(admin_client)
+        settings.METRICS_SLOW_REQUEST_MS = 0
+        settings.METRICS_SLOW_QUERIES_LOGGED = 2
+        with caplog.at_level(logging.WARNING, logger='api.metrics'):
+            client.get('/api/v1/titles/')
+        records = [record for record in caplog.records
+                   if record.name == 'api.metrics']
+        assert len(records) == 1, (
+            'Проверьте, что запросы дольше порога попадают в журнал.'
+        )
+        message = records[0].getMessage()
+        assert 'TitleViewSet.list' in message
+        assert message.count(' ms: SELECT') == 2, (
+            'Проверьте, что в журнал попадают самые медленные SQL-запросы.'
+        )
+
+        settings.METRICS_SLOW_REQUEST_MS = 10 ** 6
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='api.metrics'):
+            client.get('/api/v1/titles/')
+        assert not [record for record in caplog.records
+                    if record.name == 'api.metrics']
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Benchmarks:
+
+    def test_01_benchmark_covers_every_route(self):
+        from benchmarks.datasets import Scale
+        from benchmarks.runner import compare, run
+
+        report = run(Scale(users=5, titles=10, reviews=30, comments=20),
+                     iterations=2, warmup=0)
+        assert report['dataset']['review'] == 30
+        assert report['uncovered_routes'] == [], (
+            'Проверьте, что бенчмарк обращается к каждому маршруту API.'
+        )
+        for name, result in report['endpoints'].items():
+            assert all(int(status) < 400 for status in result['statuses']), (
+                f'Сценарий бенчмарка `{name}` должен выполняться успешно.'
+            )
+            assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+        assert compare(report, report) == []
+
+    def test_02_datasets_are_deterministic(self, django_user_model):
+        from benchmarks.datasets import Scale, generate
+        from reviews.models import Category, Genre, Review, Title
+
+        scale = Scale(users=3, titles=4, reviews=10, comments=5)
+        rows = []
+        for _ in range(2):
+            generate(scale, seed=7)
+            rows.append(list(Review.objects.order_by('pk').values_list(
+                'title__name', 'author__username', 'score', 'text')))
+            for model in (Title, Category, Genre, django_user_model):
+                model.objects.all().delete()
+        assert rows[0] == rows[1], (
+            'Проверьте, что набор данных воспроизводится при том же seed.'
+        )
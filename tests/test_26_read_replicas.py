@@ -0,0 +1,163 @@
+import sqlite3
+
+import pytest
+from django.db import connections, transaction
+
+from tests.utils import create_titles
+
+REPLICAS = ('test_replica_1', 'test_replica_2')
+
+
+@pytest.fixture
+def titles(admin_client):
+    titles, _, _ = create_titles(admin_client)
+    return titles
+
+
+@pytest.fixture
+def replica_files(settings, tmp_path, titles):
+    from core.db_routers import replicas
+
+    primary = connections['default']
+    primary.ensure_connection()
+    paths = {}
+    for number, alias in enumerate(REPLICAS, 1):
+        paths[alias] = tmp_path / f'{alias}.sqlite3'
+        copy = sqlite3.connect(paths[alias])
+        primary.connection.backup(copy)
+        copy.execute('UPDATE reviews_title SET name = ? WHERE id = ?',
+                     (f'Реплика {number}', titles[0]['id']))
+        copy.commit()
+        copy.close()
+        connections.settings[alias] = dict(
+            primary.settings_dict, NAME=str(paths[alias]))
+    settings.DATABASE_REPLICAS = list(REPLICAS)
+    replicas.reset()
+    yield paths
+    for alias in REPLICAS:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+    replicas.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReadReplicas:
+
+    def get_name(self, client, title):
+        response = client.get(f'/api/v1/titles/{title["id"]}/')
+        assert response.status_code == 200
+        return response.json()['name']
+
+    def test_01_safe_requests_round_robin(self, client, titles,
+                                          replica_files):
+        names = [self.get_name(client, titles[0]) for _ in range(4)]
+        assert names == ['Реплика 1', 'Реплика 2'] * 2, (
+            'Проверьте, что безопасные запросы читают данные из реплик по '
+            'очереди.'
+        )
+
+    def test_02_read_your_writes(self, client, admin_client, titles,
+                                 replica_files, settings):
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'year': 1985})
+        assert response.status_code == 200
+        assert 'primary_until' in response.cookies
+        assert self.get_name(admin_client, titles[0]) == titles[0]['name'], (
+            'Проверьте, что после записи клиент читает данные с основной '
+            'базы.'
+        )
+        assert self.get_name(client, titles[0]).startswith('Реплика'), (
+            'Проверьте, что закрепление за основной базой действует только '
+            'на клиента, который выполнил запись.'
+        )
+        settings.REPLICA_PIN_SECONDS = 0
+        admin_client.patch(url, data={'year': 1986})
+        assert self.get_name(admin_client, titles[0]).startswith('Реплика')
+
+    def test_03_unhealthy_replica_is_skipped(self, client, titles,
+                                             replica_files):
+        replica_files[REPLICAS[0]].write_bytes(b'not a database' * 100)
+        names = {self.get_name(client, titles[0]) for _ in range(4)}
+        assert names == {'Реплика 2'}, (
+            'Проверьте, что недоступная реплика исключается из ротации.'
+        )
+        replica_files[REPLICAS[1]].write_bytes(b'not a database' * 100)
+        from core.db_routers import replicas
+        replicas.reset()
+        assert self.get_name(client, titles[0]) == titles[0]['name'], (
+            'Проверьте, что при недоступности всех реплик чтение идёт с '
+            'основной базы.'
+        )
+
+    def test_04_writes_and_transactions_use_primary(self, titles,
+                                                    replica_files):
+        from core.db_routers import ReplicaRouter, replica_reads
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) == 'default'
+        with replica_reads():
+            assert router.db_for_read(Title) in REPLICAS
+            assert router.db_for_write(Title) == 'default'
+            with transaction.atomic():
+                assert router.db_for_read(Title) == 'default'
+                assert Title.objects.get(
+                    pk=titles[0]['id']).name == titles[0]['name']
+        assert not router.allow_migrate(REPLICAS[0], 'reviews')
+
+    def test_05_cached_lists_read_primary(self, client, titles,
+                                          replica_files):
+        response = client.get('/api/v1/titles/')
+        names = {title['name'] for title in response.json()['results']}
+        assert titles[0]['name'] in names and not any(
+            name.startswith('Реплика') for name in names), (
+            'Проверьте, что кешируемые списки читаются с основной базы, '
+            'чтобы отстающая реплика не попала в кеш.'
+        )
+        assert self.get_name(client, titles[0]).startswith('Реплика')
+
+    def test_06_replica_queries_in_metrics(self, client, admin_client,
+                                           titles, replica_files):
+        assert self.get_name(client, titles[0]).startswith('Реплика')
+        lines = admin_client.get('/api/v1/metrics/').content.decode()
+        queries = next(line for line in lines.splitlines() if line.startswith(
+            'api_request_db_queries_sum{view="TitleViewSet",'
+            'action="retrieve"'))
+        assert float(queries.split()[-1]) > 0, (
+            'Проверьте, что в метриках учитываются запросы ко всем базам, '
+            'включая реплики.'
+        )
+
+    def test_07_pin_clients_without_cookies(self, admin_client, user_client,
+                                            titles, replica_files):
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'year': 1985})
+        assert response.status_code == 200
+        admin_client.cookies.clear()
+        assert self.get_name(admin_client, titles[0]) == titles[0]['name'], (
+            'Проверьте, что после записи клиент с токеном в заголовке '
+            'читает данные с основной базы и без cookie.'
+        )
+
+        response = user_client.patch(url, data={'year': 1986})
+        assert response.status_code == 403
+        assert 'primary_until' not in response.cookies, (
+            'Проверьте, что отклонённые изменяющие запросы не закрепляют '
+            'клиента за основной базой.'
+        )
+        assert self.get_name(user_client, titles[0]).startswith('Реплика')
+
+    def test_08_replicas_skip_search_prepare(self, replica_files,
+                                             monkeypatch):
+        from reviews.search import SQLiteFTS5Backend
+
+        prepared = []
+        monkeypatch.setattr(
+            SQLiteFTS5Backend, 'prepare_connection',
+            lambda self, connection: prepared.append(connection.alias))
+        connections[REPLICAS[0]].ensure_connection()
+        assert prepared == [], (
+            'Проверьте, что новые соединения с репликами не выполняют '
+            'лишний запрос к таблицам полнотекстового поиска.'
+        )
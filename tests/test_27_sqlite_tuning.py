@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+def pragmas(wrapper, *names):
+    with wrapper.cursor() as cursor:
+        values = {}
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SQLiteTuning:
+
+    def open_file_database(self, tmp_path):
+        return DatabaseWrapper(
+            dict(connection.settings_dict,
+                 NAME=str(tmp_path / 'tuning.sqlite3')),
+            alias='tuning_check')
+
+    def test_01_pragmas_on_new_connections(self, tmp_path):
+        wrapper = self.open_file_database(tmp_path)
+        try:
+            assert pragmas(wrapper, 'journal_mode', 'synchronous',
+                           'cache_size', 'mmap_size', 'busy_timeout',
+                           'temp_store') == {
+                'journal_mode': 'wal',
+                'synchronous': 1,
+                'cache_size': -64000,
+                'mmap_size': 256 * 1024 * 1024,
+                'busy_timeout': 5000,
+                'temp_store': 2,
+            }, (
+                'Проверьте, что при открытии соединения с SQLite включаются '
+                'WAL и настройки из `SQLITE_PRAGMAS`.'
+            )
+        finally:
+            wrapper.close()
+        assert pragmas(connection, 'busy_timeout')['busy_timeout'] == 5000
+
+    def test_02_pragmas_are_configurable(self, tmp_path, settings):
+        settings.SQLITE_PRAGMAS = {'busy_timeout': 250}
+        wrapper = self.open_file_database(tmp_path)
+        try:
+            assert pragmas(wrapper, 'journal_mode', 'busy_timeout') == {
+                'journal_mode': 'delete', 'busy_timeout': 250
+            }
+        finally:
+            wrapper.close()
+
+    def test_03_persistent_connections(self, settings):
+        assert connection.settings_dict['CONN_MAX_AGE'] == (
+            settings.CONN_MAX_AGE
+        ) > 0, (
+            'Проверьте, что соединения с базой переиспользуются между '
+            'запросами (`CONN_MAX_AGE`).'
+        )
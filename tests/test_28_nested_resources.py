@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_comment, create_single_review
+
+
+@pytest.fixture
+def chain(admin_client, user_client):
+    from reviews.models import Category, Title
+
+    category = Category.objects.create(name='Фильм', slug='film')
+    titles = [
+        Title.objects.create(name=f'Произведение {idx}', year=2000,
+                             category=category)
+        for idx in range(2)
+    ]
+    reviews = [
+        create_single_review(admin_client, title.id, 'Отзыв', 5).json()['id']
+        for title in titles
+    ]
+    comment = create_single_comment(
+        admin_client, titles[0].id, reviews[0], 'Комментарий').json()['id']
+    return {
+        'title_id': titles[0].id,
+        'other_title_id': titles[1].id,
+        'review_id': reviews[0],
+        'other_review_id': reviews[1],
+        'comment_id': comment,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28NestedResources:
+
+    @pytest.mark.parametrize('method,url_template', (
+        ('get', '/api/v1/titles/{other_title_id}/reviews/{review_id}/'),
+        ('patch', '/api/v1/titles/{other_title_id}/reviews/{review_id}/'),
+        ('get',
+         '/api/v1/titles/{other_title_id}/reviews/{review_id}/comments/'),
+        ('post',
+         '/api/v1/titles/{other_title_id}/reviews/{review_id}/comments/'),
+        ('get', '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+                '{other_review_id}/'),
+        ('get', '/api/v1/titles/{title_id}/reviews/{other_review_id}/'
+                'comments/{comment_id}/'),
+        ('delete', '/api/v1/titles/{other_title_id}/reviews/{review_id}/'
+                   'comments/{comment_id}/'),
+        ('post', '/api/v1/titles/0/reviews/'),
+    ))
+    def test_01_mismatched_parents(self, admin_client, chain, method,
+                                   url_template):
+        url = url_template.format(**chain)
+        response = getattr(admin_client, method)(
+            url, data={'text': 'Текст', 'score': 3})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что {method.upper()}-запрос к `{url_template}` '
+            'с родительскими объектами из разных веток возвращает ответ со '
+            'статусом 404.'
+        )
+
+    @pytest.mark.parametrize('method,url_template,budget', (
+        ('post', '/api/v1/titles/{other_title_id}/reviews/', 6),
+        ('patch', '/api/v1/titles/{title_id}/reviews/{review_id}/', 5),
+        ('post',
+         '/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 6),
+        ('patch', '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+                  '{comment_id}/', 2),
+        ('delete', '/api/v1/titles/{title_id}/reviews/{review_id}/'
+                   'comments/{comment_id}/', 4),
+    ))
+    def test_02_write_query_budget(self, user_client, admin_client, chain,
+                                   method, url_template, budget,
+                                   django_assert_max_num_queries):
+        client = user_client if method == 'post' else admin_client
+        url = url_template.format(**chain)
+        with django_assert_max_num_queries(budget):
+            response = getattr(client, method)(
+                url, data={'text': 'Текст', 'score': 3})
+        assert response.status_code < 300, (
+            f'Проверьте, что {method.upper()}-запрос к `{url_template}` '
+            'выполняется успешно.'
+        )
@@ -0,0 +1,104 @@
+import sqlite3
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.db import connections
+from rest_framework.test import APIClient
+
+THREADS = 8
+ATTEMPTS = 32
+
+
+@pytest.fixture
+def title():
+    from reviews.models import Category, Title
+
+    category = Category.objects.create(name='Фильм', slug='film')
+    return Title.objects.create(name='Произведение', year=2000,
+                                category=category)
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    # The in-memory test database fails concurrent writers at once, new
+    # threads get a file copy that locks like a real SQLite deployment.
+    primary = connections['default']
+    primary.ensure_connection()
+    path = tmp_path / 'reviews.sqlite3'
+    copy = sqlite3.connect(path)
+    primary.connection.backup(copy)
+    copy.close()
+    original = connections.settings['default']
+    connections.settings['default'] = dict(original, NAME=str(path))
+    yield path
+    connections.settings['default'] = original
+
+
+def in_thread(func):
+    def call():
+        try:
+            return func()
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(call).result()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ReviewConflicts:
+
+    def test_01_duplicate_review(self, user_client, title,
+                                 django_assert_max_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400.'
+        )
+        assert 'non_field_errors' in response.json()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (1, 7), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_02_concurrent_duplicates(self, token_user, title,
+                                      file_database):
+        from reviews.models import Title
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        def post(score):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}')
+            client.raise_request_exception = False
+            try:
+                return client.post(
+                    url, data={'text': 'Отзыв', 'score': score}
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            statuses = Counter(pool.map(
+                post, [idx % 10 + 1 for idx in range(ATTEMPTS)]))
+        assert statuses == Counter({
+            HTTPStatus.CREATED: 1,
+            HTTPStatus.BAD_REQUEST: ATTEMPTS - 1,
+        }), (
+            'Проверьте, что одновременные отзывы одного пользователя на '
+            'произведение создают ровно один отзыв, а остальные запросы '
+            'получают ответ со статусом 400.'
+        )
+        title, score = in_thread(lambda: (
+            Title.objects.get(pk=title.pk), title.reviews.get().score))
+        assert (title.reviews_count, title.score_sum) == (1, score), (
+            'Проверьте, что рейтинг учитывает только созданный отзыв.'
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.fixture
+def asgi_app():
+    from api.asgi import get_asgi_application
+
+    return get_asgi_application()
+
+
+@pytest.fixture
+def pooled_calls(monkeypatch):
+    import api.asgi
+
+    calls = []
+    run_in_pool = api.asgi.run_in_pool
+
+    def counting(func, *args):
+        calls.append(func)
+        return run_in_pool(func, *args)
+
+    monkeypatch.setattr(api.asgi, 'run_in_pool', counting)
+    return calls
+
+
+def request(app, path, method='GET', token=None, data=None):
+    from benchmarks.asgi import call_asgi
+
+    headers = [('accept', 'application/json')]
+    if token:
+        headers.append(('authorization', f'Bearer {token["access"]}'))
+    body = b''
+    if data is not None:
+        body = json.dumps(data).encode()
+        headers.append(('content-type', 'application/json'))
+    status, headers, content = asyncio.run(
+        call_asgi(app, method, path, headers, body))
+    return status, dict(headers), content
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30ASGI:
+
+    def test_01_same_responses_as_wsgi(self, asgi_app, client, admin,
+                                       admin_client, user, user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client})
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for path in ('/api/v1/categories/', '/api/v1/genres/',
+                     '/api/v1/titles/', title_url, f'{title_url}reviews/',
+                     f'{title_url}reviews/{reviews[0]["id"]}/comments/'):
+            response = client.get(path)
+            status, headers, content = request(asgi_app, path)
+            assert (status, json.loads(content)) == (
+                response.status_code, response.json()), (
+                f'Проверьте, что через ASGI `{path}` возвращает тот же '
+                'ответ, что и через WSGI.'
+            )
+
+    def test_02_cached_lists_skip_the_pool(self, asgi_app, admin_client,
+                                           pooled_calls):
+        from api.cache import get_stats
+
+        create_titles(admin_client)
+        first = request(asgi_app, '/api/v1/titles/')
+        assert len(pooled_calls) == 1
+        second = request(asgi_app, '/api/v1/titles/')
+        assert len(pooled_calls) == 1, (
+            'Проверьте, что закэшированный список отдаётся без обращения к '
+            'пулу потоков.'
+        )
+        assert second == first
+        assert get_stats()['titles'] == {'hits': 1, 'misses': 1}
+        request(asgi_app, '/api/v1/titles/?year=1985')
+        assert len(pooled_calls) == 2
+
+    def test_03_writes_invalidate_cached_lists(self, asgi_app, token_admin,
+                                               pooled_calls):
+        request(asgi_app, '/api/v1/categories/')
+        status, _, _ = request(asgi_app, '/api/v1/categories/', 'POST',
+                               token_admin, {'name': 'Фильм', 'slug': 'film'})
+        assert status == HTTPStatus.CREATED
+        _, _, content = request(asgi_app, '/api/v1/categories/')
+        assert json.loads(content)['count'] == 1, (
+            'Проверьте, что после записи список не отдаётся из кэша.'
+        )
+        assert len(pooled_calls) == 3
+
+    def test_04_authenticated_requests_use_the_pool(self, asgi_app,
+                                                    token_admin,
+                                                    pooled_calls):
+        for _ in range(2):
+            status, _, _ = request(asgi_app, '/api/v1/genres/',
+                                   token=token_admin)
+            assert status == HTTPStatus.OK
+        assert len(pooled_calls) == 2
+
+    def test_05_streaming_responses(self, asgi_app, admin_client,
+                                    token_admin):
+        titles, _, _ = create_titles(admin_client)
+        status, headers, content = request(
+            asgi_app, '/api/v1/export/titles/', token=token_admin)
+        assert status == HTTPStatus.OK
+        assert headers[b'Content-Type'] == b'application/x-ndjson'
+        assert len(content.decode().splitlines()) == len(titles), (
+            'Проверьте, что потоковые ответы полностью передаются через '
+            'ASGI.'
+        )
+
+    def test_06_benchmark(self):
+        from benchmarks.asgi import SERVERS, run
+        from benchmarks.datasets import Scale
+
+        report = run(Scale(users=3, titles=5, reviews=10, comments=5),
+                     concurrency=(5,), duration=0.2)
+        for server in SERVERS:
+            assert report[server]['5']['requests'] > 0
+            assert report[server]['5']['errors'] == {}, (
+                f'Проверьте, что бенчмарк `{server}` выполняется без ошибок.'
+            )
@@ -0,0 +1,152 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+SPECIAL_VALUES = {
+    'aware': datetime(2023, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'offset': datetime(2023, 5, 1, 12, 30,
+                       tzinfo=timezone(timedelta(hours=3))),
+    'naive': datetime(2023, 5, 1, 12, 30),
+    'date': date(2023, 5, 1),
+    'time': time(8, 15, 0, 500),
+    'duration': timedelta(hours=1, seconds=30),
+    'decimal': Decimal('7.25'),
+    'lazy': gettext_lazy('Произведение'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'separators': 'строка\u2028абзац\u2029',
+    'numbers': [0, -1, 7.5, 0.1, 2 ** 63 - 1, True, None],
+    'tuple': (1, 'два'),
+    1: 'числовой ключ',
+}
+
+
+def render(data, accepted_media_type=None):
+    from api.renderers import FastJSONRenderer
+
+    return FastJSONRenderer().render(data, accepted_media_type)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31JSONRenderer:
+
+    def test_01_default_classes(self, client):
+        from api.parsers import FastJSONParser
+        from api.renderers import FastJSONRenderer
+        from api.views import TitleViewSet
+
+        view = TitleViewSet()
+        assert isinstance(view.get_renderers()[0], FastJSONRenderer), (
+            'Проверьте, что `FastJSONRenderer` — рендерер по умолчанию в '
+            '`REST_FRAMEWORK`.'
+        )
+        assert isinstance(view.get_parsers()[0], FastJSONParser), (
+            'Проверьте, что `FastJSONParser` — парсер по умолчанию в '
+            '`REST_FRAMEWORK`.'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response['Content-Type'] == 'application/json'
+
+    def test_02_api_responses_match_stdlib(self, admin, admin_client, user,
+                                           user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client})
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for path in ('/api/v1/categories/', '/api/v1/genres/',
+                     '/api/v1/titles/', title_url, f'{title_url}reviews/',
+                     f'{title_url}reviews/{reviews[0]["id"]}/',
+                     f'{title_url}reviews/{reviews[0]["id"]}/comments/'):
+            response = admin_client.get(path)
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == JSONRenderer().render(
+                response.data), (
+                f'Проверьте, что ответ `{path}` побайтно совпадает с '
+                'ответом стандартного `JSONRenderer`.'
+            )
+
+    def test_03_special_values(self):
+        assert render(SPECIAL_VALUES) == JSONRenderer().render(
+            SPECIAL_VALUES), (
+            'Проверьте, что даты, `Decimal`, ленивые строки, UUID и '
+            'нестроковые ключи сериализуются так же, как в `JSONRenderer`.'
+        )
+        assert b'\\u2028' in render(SPECIAL_VALUES)
+        data = {'big': 2 ** 70, 'values': {1, 2}}
+        assert render(data) == JSONRenderer().render(data), (
+            'Проверьте, что значения, которые не поддерживает orjson, '
+            'сериализуются стандартным кодировщиком.'
+        )
+        assert render(None) == b''
+
+    def test_04_indent(self, client):
+        media_type = 'application/json; indent=4'
+        assert render(SPECIAL_VALUES, media_type) == JSONRenderer().render(
+            SPECIAL_VALUES, media_type), (
+            'Проверьте, что при запросе отступов ответ форматируется так же, '
+            'как в `JSONRenderer`.'
+        )
+        response = client.get('/api/v1/genres/', HTTP_ACCEPT=media_type)
+        assert b'\n    "count"' in response.content
+
+    def test_05_parser(self):
+        from api.parsers import FastJSONParser
+
+        content = JSONRenderer().render(SPECIAL_VALUES)
+        parsed = FastJSONParser().parse(io.BytesIO(content))
+        assert parsed == JSONParser().parse(io.BytesIO(content)), (
+            'Проверьте, что `FastJSONParser` разбирает тело запроса так же, '
+            'как `JSONParser`.'
+        )
+        assert FastJSONParser().parse(
+            io.BytesIO('{"text": "ёж"}'.encode('cp1251')),
+            parser_context={'encoding': 'cp1251'}) == {'text': 'ёж'}
+        for body in (b'{"score": ', b'{"score": NaN}', b'\xff'):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_06_invalid_request_body(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": ',
+            content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['detail'].startswith('JSON parse error'), (
+            'Проверьте, что некорректный JSON в теле запроса возвращает '
+            'ошибку разбора со статусом 400.'
+        )
+
+    def test_07_fallback_without_orjson(self, monkeypatch):
+        import api.parsers
+        import api.renderers
+
+        monkeypatch.setattr(api.renderers, 'orjson', None)
+        monkeypatch.setattr(api.parsers, 'orjson', None)
+        content = render(SPECIAL_VALUES)
+        assert content == JSONRenderer().render(SPECIAL_VALUES), (
+            'Проверьте, что без orjson используется стандартный `json`.'
+        )
+        assert api.parsers.FastJSONParser().parse(
+            io.BytesIO(content))['decimal'] == 7.25
+
+    def test_08_benchmark(self):
+        from benchmarks.datasets import Scale
+        from benchmarks.json_rendering import run
+
+        report = run(Scale(users=3, titles=5, reviews=10, comments=5),
+                     page_sizes=(5,), iterations=2)
+        for name in ('titles', 'reviews'):
+            page = report[name]['5']
+            assert page['rows'] == 5
+            assert page['identical'], (
+                f'Проверьте, что страницы `{name}` в бенчмарке рендерятся '
+                'одинаково обоими рендерерами.'
+            )
+            assert page['render']['fast_us'] > 0
@@ -0,0 +1,175 @@
+import random
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+from django.test.utils import override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+SEEDS = range(5)
+ALPHABET = 'abcxyzАБВёж "\\/\n\t 😀'
+
+
+def random_text(rng, low=0, high=20):
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(low, high)))
+
+
+def random_float(rng):
+    return rng.choice((None, 0.0, 0.1 + 0.2, 1e-7, rng.uniform(1, 10),
+                       float(rng.randint(1, 10))))
+
+
+def random_date(rng):
+    return datetime(2000, 1, 1, tzinfo=timezone.utc) + timedelta(
+        seconds=rng.randint(0, 10 ** 9), microseconds=rng.choice(
+            (0, rng.randint(1, 999999))))
+
+
+def generate(seed):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    rng = random.Random(seed)
+    users = [get_user_model().objects.create(
+        username=f'user_{seed}_{idx}', email=f'user_{seed}_{idx}@yamdb.fake')
+        for idx in range(5)]
+    categories = [Category.objects.create(
+        name=random_text(rng, 1), slug=f'category-{seed}-{idx}')
+        for idx in range(3)]
+    genres = [Genre.objects.create(
+        name=random_text(rng, 1), slug=f'genre-{seed}-{idx}')
+        for idx in range(5)]
+    titles = []
+    for _ in range(rng.randint(5, 15)):
+        title = Title.objects.create(
+            name=random_text(rng, 1), year=rng.randint(-500, 2030),
+            description=random_text(rng, 0, 50),
+            category=rng.choice(categories + [None]),
+            rating=random_float(rng), weighted_rating=random_float(rng),
+            reviews_count=rng.randint(0, 100))
+        title.genre.set(rng.sample(genres, rng.randint(0, len(genres))))
+        titles.append(title)
+    for title in titles:
+        for author in rng.sample(users, rng.randint(0, len(users))):
+            review = Review.objects.create(
+                title=title, author=author, text=random_text(rng),
+                score=rng.randint(1, 10),
+                comments_count=rng.randint(0, 10))
+            Review.objects.filter(pk=review.pk).update(
+                pub_date=random_date(rng))
+            for _ in range(rng.randint(0, 3)):
+                comment = Comment.objects.create(
+                    review=review, author=rng.choice(users),
+                    text=random_text(rng))
+                Comment.objects.filter(pk=comment.pk).update(
+                    pub_date=random_date(rng))
+    return titles
+
+
+def get_paths(seed):
+    from reviews.models import Comment, Genre, Review, Title
+
+    paths = [
+        '/api/v1/titles/', '/api/v1/titles/?page=2',
+        '/api/v1/titles/?ordering=-rating',
+        f'/api/v1/titles/?genre=genre-{seed}-0',
+        f'/api/v1/titles/?category=category-{seed}-1',
+        f'/api/v1/titles/?search={Genre.objects.first().name[:1]}',
+        '/api/v1/titles/?stats=1',
+    ]
+    for title in Title.objects.all():
+        paths += [f'/api/v1/titles/{title.pk}/',
+                  f'/api/v1/titles/{title.pk}/reviews/',
+                  f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor']
+    for review in Review.objects.all():
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+        paths += [url, f'{url}comments/']
+    for comment in Comment.objects.select_related('review'):
+        paths.append(f'/api/v1/titles/{comment.review.title_id}/reviews/'
+                     f'{comment.review_id}/comments/{comment.pk}/')
+    return paths
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32CompiledSerializers:
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_01_same_output_as_serializers(self, seed):
+        from api.compiled import get_compiled_serializer
+        from api.query_plans import plan_queryset
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleSerializer)
+        from reviews.models import Comment, Review, Title
+
+        generate(seed)
+        for serializer_class, model in ((TitleSerializer, Title),
+                                        (ReviewSerializer, Review),
+                                        (CommentSerializer, Comment)):
+            queryset = plan_queryset(
+                model.objects.order_by('pk'), serializer_class)
+            compiled = get_compiled_serializer(serializer_class)
+            expected = JSONRenderer().render(
+                serializer_class(queryset, many=True).data)
+            rows = compiled.get_queryset(queryset)
+            assert JSONRenderer().render(
+                compiled.serialize(rows, rows.db)) == expected, (
+                'Проверьте, что скомпилированный '
+                f'`{serializer_class.__name__}`'
+                ' возвращает те же данные, что и сериализатор.'
+            )
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_02_same_responses(self, seed, admin_client):
+        generate(seed)
+        for path in get_paths(seed):
+            with override_settings(COMPILED_SERIALIZERS=False):
+                expected = admin_client.get(path)
+            response = admin_client.get(path)
+            assert response.status_code == expected.status_code
+            assert response.content == expected.content, (
+                f'Проверьте, что ответ `{path}` не зависит от '
+                '`COMPILED_SERIALIZERS`.'
+            )
+
+    def test_03_skips_serializers(self, admin_client, monkeypatch):
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleSerializer)
+
+        titles = generate(0)
+        for serializer_class in (TitleSerializer, ReviewSerializer,
+                                 CommentSerializer):
+            monkeypatch.setattr(serializer_class, 'to_representation', None)
+        review = titles[0].reviews.first() or titles[1].reviews.first()
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+        for path in ('/api/v1/titles/', f'/api/v1/titles/{titles[0].pk}/',
+                     url, f'{url}comments/'):
+            response = admin_client.get(path)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{path}` отдаётся без вызова '
+                '`to_representation` сериализатора.'
+            )
+        response = admin_client.get(f'/api/v1/titles/{titles[-1].pk + 1}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_unsupported_serializers(self):
+        from api.compiled import get_compiled_serializer
+        from api.serializers import TitleStatsSerializer
+        from reviews.models import Title
+
+        class MethodSerializer(serializers.ModelSerializer):
+            extra = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Title
+                fields = ('id', 'extra')
+
+            def get_extra(self, obj):
+                return obj.pk
+
+        assert get_compiled_serializer(TitleStatsSerializer) is None
+        assert get_compiled_serializer(MethodSerializer) is None, (
+            'Проверьте, что сериализаторы с полями, которым нужен объект '
+            'модели, не компилируются.'
+        )